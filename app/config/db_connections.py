@@ -7,6 +7,7 @@ asyncpg + SQLAlchemy async 사용
 import logging
 from typing import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -30,9 +31,17 @@ def get_engine():
         _engine = create_async_engine(
             settings.async_database_url,
             echo=settings.db_echo,
-            pool_size=5,
-            max_overflow=10,
+            # 기본 AsyncAdaptedQueuePool 사용 (NullPool 금지 - 메시지마다 재연결 방지)
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
             pool_pre_ping=True,
+            # 최근 사용한 커넥션 우선 재사용 (warm 커넥션 유지, 유휴 커넥션은 자연 정리)
+            pool_use_lifo=True,
+            connect_args={
+                "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+            },
         )
         logger.info(f"Database engine created: {settings.effective_db_host}:{settings.db_port}/{settings.db_name}")
     
@@ -80,8 +89,6 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 async def init_db():
     """데이터베이스 연결 테스트"""
-    from sqlalchemy import text
-    
     engine = get_engine()
     
     async with engine.begin() as conn:
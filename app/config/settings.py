@@ -37,6 +37,14 @@ class Settings(BaseSettings):
     db_user: str = "postgres"
     db_password: str = ""
     db_echo: bool = False
+
+    # 커넥션 풀 설정
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    # asyncpg prepared statement 캐시 크기 (커넥션별, 반복 쿼리 parse/plan 생략)
+    db_prepared_statement_cache_size: int = 500
     
     # Docker 네트워크 사용 여부
     db_use_docker_network: bool = False
@@ -4,16 +4,16 @@
 STOP 신호를 받으면 캐시에 남아있는 마지막 시간 데이터를 시간봉으로 변환 후 DB 저장
 """
 
+import asyncio
 import logging
-from datetime import datetime, date, time
-from typing import Dict, List, Optional
+from datetime import datetime, date
+from typing import Dict, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
-from sqlalchemy.dialects.postgresql import insert
-
 from app.config.db_connections import get_session_factory
-from app.services.price_cache import get_price_cache
-from app.schemas.price import PriceMessage
+from app.repositories.candle_repository import CandleRepository
+from app.services.price_cache import Tick, get_price_cache
+from app.utils.candle_aggregator import aggregate_stock_ticks
 from app.kafka.websocket_command_consumer import WebSocketCommandMessage
 from app.database.database.strategy import HourCandleData, MinuteCandleData
 
@@ -22,130 +22,14 @@ logger = logging.getLogger(__name__)
 KST = ZoneInfo("Asia/Seoul")
 
 
-class HourCandleAggregator:
-    """틱 데이터를 1시간봉으로 집계"""
-
-    def __init__(self):
-        self.open: Optional[float] = None
-        self.high: Optional[float] = None
-        self.low: Optional[float] = None
-        self.close: Optional[float] = None
-        self.volume: int = 0
-        self.trade_count: int = 0
-
-    def add_tick(self, price: float, volume: int) -> None:
-        """틱 데이터 추가"""
-        if self.open is None:
-            self.open = price
-
-        if self.high is None or price > self.high:
-            self.high = price
-
-        if self.low is None or price < self.low:
-            self.low = price
-
-        self.close = price
-        self.volume += volume
-        self.trade_count += 1
-
-    def to_dict(self, stock_code: str, candle_date: date, hour: int) -> dict:
-        """딕셔너리로 변환"""
-        return {
-            "stock_code": stock_code,
-            "candle_date": candle_date,
-            "hour": hour,
-            "open": self.open or 0,
-            "high": self.high or 0,
-            "low": self.low or 0,
-            "close": self.close or 0,
-            "volume": self.volume,
-            "trade_count": self.trade_count,
-        }
-
-
-def aggregate_ticks_to_candle(
-    stock_code: str,
-    ticks: List[PriceMessage],
-    candle_date: date,
-    hour: int
-) -> Optional[dict]:
-    """틱 데이터를 단일 시간봉으로 집계"""
-    if not ticks:
-        return None
-
-    aggregator = HourCandleAggregator()
-
-    for tick in ticks:
-        try:
-            price = float(tick.current_price)
-            volume = int(tick.trade_volume)
-            aggregator.add_tick(price, volume)
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Invalid tick data: {e}")
-            continue
-
-    if aggregator.trade_count == 0:
-        return None
-
-    return aggregator.to_dict(stock_code, candle_date, hour)
-
-
-def aggregate_ticks_to_minute_candles(
-    stock_code: str,
-    ticks: List[PriceMessage],
-    candle_date: date,
-    minute_interval: int = 1
-) -> List[dict]:
-    """틱 데이터를 분봉으로 집계"""
-    if not ticks:
-        return []
-
-    # minute_interval에 맞게 그룹핑 (trade_time: HHMMSS)
-    minute_groups: Dict[int, List[PriceMessage]] = {}
-    for tick in ticks:
-        hh = int(tick.trade_time[:2])
-        mm = int(tick.trade_time[2:4])
-        aligned_mm = (mm // minute_interval) * minute_interval
-        minute_key = hh * 100 + aligned_mm
-        if minute_key not in minute_groups:
-            minute_groups[minute_key] = []
-        minute_groups[minute_key].append(tick)
-
-    candles = []
-    for minute_key, minute_ticks in sorted(minute_groups.items()):
-        aggregator = HourCandleAggregator()
-        for tick in minute_ticks:
-            try:
-                price = float(tick.current_price)
-                volume = int(tick.trade_volume)
-                aggregator.add_tick(price, volume)
-            except (ValueError, TypeError):
-                continue
-
-        if aggregator.trade_count > 0:
-            hh, mm = divmod(minute_key, 100)
-            candles.append({
-                "stock_code": stock_code,
-                "candle_date": candle_date,
-                "candle_time": time(hh, mm, 0),
-                "minute_interval": minute_interval,
-                "open": aggregator.open or 0,
-                "high": aggregator.high or 0,
-                "low": aggregator.low or 0,
-                "close": aggregator.close or 0,
-                "volume": aggregator.volume,
-                "trade_count": aggregator.trade_count,
-            })
-
-    return candles
-
-
 class CandleHandler:
     """시간봉 캔들 생성 핸들러"""
 
     def __init__(self):
         self._price_cache = get_price_cache()
         self._session_factory = get_session_factory()
+        # 진행 중인 백그라운드 DB 저장 태스크 (GC 방지 + 종료 시 대기용)
+        self._pending_writes: Set[asyncio.Task] = set()
 
     async def handle_stop_command(self, command_msg: WebSocketCommandMessage) -> None:
         """
@@ -161,6 +45,7 @@ class CandleHandler:
 
         try:
             # 캐시에서 마지막 시간 데이터 추출 및 삭제
+            total_ticks = self._price_cache.total_ticks()
             current_hour, hour_data = self._price_cache.extract_all_data()
 
             if not hour_data or current_hour is None:
@@ -180,93 +65,101 @@ class CandleHandler:
             logger.info(
                 f"Processing last hour data: hour={current_hour}, "
                 f"date={cache_date}, stocks={len(hour_data)}, "
-                f"total_ticks={sum(len(t) for t in hour_data.values())}"
+                f"total_ticks={total_ticks}"
             )
 
-            # 종목별로 시간봉 생성
+            # 종목별 시간봉/분봉 집계 (별도 스레드에서 실행, 이벤트 루프 비차단)
+            results = await self._aggregate_all_stocks(hour_data, cache_date, current_hour)
+
             candles = []
-            for stock_code, ticks in hour_data.items():
-                candle = aggregate_ticks_to_candle(stock_code, ticks, cache_date, current_hour)
+            all_minute_candles = []
+            for candle, minute_candles in results:
                 if candle:
                     candles.append(candle)
+                all_minute_candles.extend(minute_candles)
 
             if not candles:
                 logger.info("No candles generated from tick data")
                 return
 
-            # 시간봉 DB에 저장
-            await self._save_candles_to_db(candles)
-            logger.info(f"Successfully saved {len(candles)} hour candles for hour {current_hour}")
-
-            # 분봉 생성 및 저장
-            all_minute_candles = []
-            for stock_code, ticks in hour_data.items():
-                minute_candles = aggregate_ticks_to_minute_candles(stock_code, ticks, cache_date)
-                all_minute_candles.extend(minute_candles)
-
-            if all_minute_candles:
-                await self._save_minute_candles_to_db(all_minute_candles)
-                logger.info(f"Successfully saved {len(all_minute_candles)} minute candles")
+            # DB 저장은 백그라운드로 실행 (캐시 데이터는 이미 추출됨)
+            # → consumer가 저장 완료를 기다리지 않고 바로 다음 메시지 처리
+            task = asyncio.create_task(
+                self._save_all_candles(candles, all_minute_candles, current_hour)
+            )
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
 
         except Exception as e:
             logger.error(f"Error processing STOP command: {e}", exc_info=True)
 
-    async def _save_candles_to_db(self, candles: List[dict]) -> None:
-        """시간봉 데이터를 DB에 저장 (upsert)"""
-        if HourCandleData is None:
-            logger.error("HourCandleData model not available")
-            return
+    async def _save_all_candles(
+        self,
+        candles: List[dict],
+        minute_candles: List[tuple],
+        hour: int
+    ) -> None:
+        """시간봉 + 분봉 DB 저장 (백그라운드 태스크, 예외는 로깅만)"""
+        try:
+            await self._save_candles_to_db(candles, minute_candles)
+            logger.info(
+                f"Successfully saved {len(candles)} hour candles and "
+                f"{len(minute_candles)} minute candles for hour {hour}"
+            )
 
-        async with self._session_factory() as session:
-            try:
-                stmt = insert(HourCandleData).values(candles)
-                stmt = stmt.on_conflict_do_update(
-                    constraint='uq_hour_candle_stock_date_hour',
-                    set_={
-                        'open': stmt.excluded.open,
-                        'high': stmt.excluded.high,
-                        'low': stmt.excluded.low,
-                        'close': stmt.excluded.close,
-                        'volume': stmt.excluded.volume,
-                        'trade_count': stmt.excluded.trade_count,
-                    }
-                )
-
-                await session.execute(stmt)
-                await session.commit()
+        except Exception as e:
+            logger.error(f"Error saving candles for hour {hour}: {e}", exc_info=True)
+
+    async def close(self) -> None:
+        """진행 중인 DB 저장 태스크 완료 대기 (앱 종료 시 호출)"""
+        if self._pending_writes:
+            logger.info(f"Waiting for {len(self._pending_writes)} pending candle writes")
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+    async def _aggregate_all_stocks(
+        self,
+        hour_data: Dict[str, List[Tick]],
+        candle_date: date,
+        hour: int
+    ) -> List[Tuple[Optional[dict], List[tuple]]]:
+        """
+        전 종목 집계를 별도 스레드에서 한 번에 실행
 
-            except Exception as e:
-                await session.rollback()
-                logger.error(f"Error saving candles to database: {e}", exc_info=True)
-                raise
+        순수 Python 집계는 GIL 때문에 스레드를 늘려도 병렬화되지 않으므로
+        종목별로 나누지 않고 to_thread 1회로 이벤트 루프만 비움
+        """
+        return await asyncio.to_thread(
+            lambda: [
+                aggregate_stock_ticks(stock_code, ticks, candle_date, hour)
+                for stock_code, ticks in hour_data.items()
+            ]
+        )
+
+    async def _save_candles_to_db(
+        self,
+        candles: List[dict],
+        minute_candles: List[tuple],
+    ) -> None:
+        """
+        시간봉/분봉 데이터를 한 트랜잭션으로 DB에 저장 (upsert)
 
-    async def _save_minute_candles_to_db(self, candles: List[dict]) -> None:
-        """분봉 데이터를 DB에 저장 (upsert)"""
-        if MinuteCandleData is None:
-            logger.error("MinuteCandleData model not available")
+        COPY로 임시 테이블에 적재한 뒤 INSERT ... SELECT ... ON CONFLICT 한 번으로 반영
+        (대량 INSERT 파라미터 바인딩 대신 PostgreSQL 가장 빠른 적재 경로 사용)
+        """
+        if HourCandleData is None or MinuteCandleData is None:
+            logger.error("HourCandleData/MinuteCandleData model not available")
             return
 
         async with self._session_factory() as session:
             try:
-                stmt = insert(MinuteCandleData).values(candles)
-                stmt = stmt.on_conflict_do_update(
-                    constraint='uq_minute_candle_stock_date_time_interval',
-                    set_={
-                        'open': stmt.excluded.open,
-                        'high': stmt.excluded.high,
-                        'low': stmt.excluded.low,
-                        'close': stmt.excluded.close,
-                        'volume': stmt.excluded.volume,
-                        'trade_count': stmt.excluded.trade_count,
-                    }
-                )
-
-                await session.execute(stmt)
+                candle_repository = CandleRepository(session)
+                await candle_repository.upsert_hour_candles(candles)
+                await candle_repository.upsert_minute_candle_records(minute_candles)
                 await session.commit()
 
             except Exception as e:
                 await session.rollback()
-                logger.error(f"Error saving minute candles to database: {e}", exc_info=True)
+                logger.error(f"Error saving candles to database: {e}", exc_info=True)
                 raise
 
 
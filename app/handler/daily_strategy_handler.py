@@ -8,12 +8,11 @@ Kafka에서 수신한 일일 전략 메시지를 처리하고 데이터베이스
 import logging
 from typing import Optional, List, Dict
 
-from sqlalchemy import select, func, delete
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, delete, insert, update
 from sqlalchemy.orm import selectinload
 
 from app.config.db_connections import get_session_factory
-from app.schemas.daily_strategy import DailyStrategyMessage
+from app.schemas.daily_strategy import DailyStrategyMessage, DailyStrategy as DailyStrategyPayload
 from app.database.database.strategy import (
     DailyStrategy as DailyStrategyModel,
     DailyStrategyStock as DailyStrategyStockModel,
@@ -48,6 +47,8 @@ class DailyStrategyHandler:
           - 거래 기록(buy/sell)이 있는 종목: 보존 (target 정보만 업데이트)
           - 거래 기록이 없는 기존 종목: target 정보 업데이트
           - 새 종목: 추가
+        같은 user_strategy_id가 메시지에 여러 번 나오면 마지막 payload만 반영
+        (이전 payload의 종목 목록은 대체되고, 빠진 종목 중 거래 기록 없는 종목은 삭제)
 
         Args:
             message: Kafka에서 수신한 일일 전략 메시지
@@ -58,160 +59,207 @@ class DailyStrategyHandler:
             f"users={len(message.strategies_by_user)}"
         )
 
-        session: Optional[AsyncSession] = None
         try:
-            session = self._session_factory()
-
-            total_strategies = 0
-            total_stocks_added = 0
-            total_stocks_updated = 0
-            total_stocks_preserved = 0
-            updated_strategies = 0
-            created_strategies = 0
-
-            message_date = message.timestamp.date()
-
-            # 각 사용자별로 처리
-            for user_strategies in message.strategies_by_user:
-                user_id = user_strategies.user_id
-
-                # 각 전략별로 처리
-                for strategy in user_strategies.strategies:
-                    # 같은 날 같은 user_strategy_id로 기존 DailyStrategy 조회 (stocks 포함)
-                    stmt = (
-                        select(DailyStrategyModel)
-                        .options(selectinload(DailyStrategyModel.stocks))
-                        .where(
-                            DailyStrategyModel.user_strategy_id == strategy.user_strategy_id,
-                            func.date(DailyStrategyModel.timestamp) == message_date,
-                        )
-                    )
-                    result = await session.execute(stmt)
-                    existing_daily_strategy = result.scalar_one_or_none()
-
-                    if existing_daily_strategy:
-                        # 기존 데이터 있음 -> 머지
-                        daily_strategy = existing_daily_strategy
-                        daily_strategy.timestamp = message.timestamp
-
-                        # 기존 종목을 stock_code 기준 dict로 변환
-                        existing_stocks: Dict[str, DailyStrategyStockModel] = {
-                            s.stock_code: s for s in daily_strategy.stocks
-                        }
-
-                        # 메시지의 종목 코드 set
-                        incoming_stock_codes = {
-                            s.stock_code for s in strategy.stocks
-                        }
-
-                        # 거래 기록 없는 기존 종목 중 메시지에 없는 것은 삭제
-                        stocks_to_delete = []
-                        for stock_code, existing_stock in existing_stocks.items():
-                            if stock_code not in incoming_stock_codes:
-                                if not self._has_trading_data(existing_stock):
-                                    stocks_to_delete.append(existing_stock.id)
-                                else:
-                                    total_stocks_preserved += 1
-                                    logger.debug(
-                                        f"Preserving traded stock not in message: "
-                                        f"stock_code={stock_code}"
-                                    )
-
-                        if stocks_to_delete:
-                            await session.execute(
-                                delete(DailyStrategyStockModel).where(
-                                    DailyStrategyStockModel.id.in_(stocks_to_delete)
+            # 세션 + 트랜잭션 컨텍스트: 정상 종료 시 커밋, 예외 시 롤백 후 커넥션 반환
+            async with self._session_factory() as session:
+                async with session.begin():
+                    total_strategies = 0
+                    total_stocks_added = 0
+                    total_stocks_updated = 0
+                    total_stocks_preserved = 0
+                    updated_strategies = 0
+                    created_strategies = 0
+
+                    message_date = message.timestamp.date()
+
+                    # user_strategy_id별 마지막 payload (last payload wins)
+                    latest_strategies: Dict[int, DailyStrategyPayload] = {}
+                    for user_strategies in message.strategies_by_user:
+                        for strategy in user_strategies.strategies:
+                            if strategy.user_strategy_id in latest_strategies:
+                                logger.warning(
+                                    f"Duplicate user_strategy_id in daily strategy message, "
+                                    f"using last payload: user_strategy_id={strategy.user_strategy_id}"
+                                )
+                            latest_strategies[strategy.user_strategy_id] = strategy
+
+                    # 신규 생성할 전략 → 루프 종료 후 INSERT ... RETURNING으로 한 번에 생성
+                    new_strategies: List[DailyStrategyPayload] = []
+
+                    # 기존 종목 업데이트 (id 기준 executemany UPDATE로 한 번에 처리)
+                    # 거래 기록 유무에 따라 갱신 컬럼이 달라 두 리스트로 분리
+                    updates_preserved: List[dict] = []
+                    updates_full: List[dict] = []
+
+                    # 각 사용자별로 처리
+                    for user_strategies in message.strategies_by_user:
+                        user_id = user_strategies.user_id
+
+                        # 각 전략별로 처리
+                        for strategy in user_strategies.strategies:
+                            if latest_strategies[strategy.user_strategy_id] is not strategy:
+                                # 뒤에 같은 user_strategy_id의 payload가 있음 → 그 payload로 대체
+                                continue
+
+                            # 같은 날 같은 user_strategy_id로 기존 DailyStrategy 조회 (stocks 포함)
+                            stmt = (
+                                select(DailyStrategyModel)
+                                .options(selectinload(DailyStrategyModel.stocks))
+                                .where(
+                                    DailyStrategyModel.user_strategy_id == strategy.user_strategy_id,
+                                    func.date(DailyStrategyModel.timestamp) == message_date,
                                 )
                             )
-
-                        # 메시지의 각 종목 처리
-                        for stock_data in strategy.stocks:
-                            existing_stock = existing_stocks.get(stock_data.stock_code)
-
-                            if existing_stock:
-                                if self._has_trading_data(existing_stock):
-                                    # 거래 기록 있음 → target 정보만 업데이트, 거래 기록 보존
-                                    existing_stock.target_price = stock_data.target_price
-                                    existing_stock.target_quantity = stock_data.target_quantity
-                                    existing_stock.target_sell_price = stock_data.target_sell_price
-                                    existing_stock.stop_loss_price = stock_data.stop_loss_price
-                                    total_stocks_preserved += 1
-                                    logger.debug(
-                                        f"Preserved traded stock: "
-                                        f"stock_code={stock_data.stock_code}, "
-                                        f"buy_price={existing_stock.buy_price}"
+                            result = await session.execute(stmt)
+                            existing_daily_strategy = result.scalar_one_or_none()
+
+                            if existing_daily_strategy:
+                                # 기존 데이터 있음 -> 머지
+                                daily_strategy = existing_daily_strategy
+                                daily_strategy.timestamp = message.timestamp
+
+                                # 기존 종목을 stock_code 기준 dict로 변환
+                                existing_stocks: Dict[str, DailyStrategyStockModel] = {
+                                    s.stock_code: s for s in daily_strategy.stocks
+                                }
+
+                                # 메시지의 종목 코드 set
+                                incoming_stock_codes = {
+                                    s.stock_code for s in strategy.stocks
+                                }
+
+                                # 거래 기록 없는 기존 종목 중 메시지에 없는 것은 삭제
+                                stocks_to_delete = []
+                                for stock_code, existing_stock in existing_stocks.items():
+                                    if stock_code not in incoming_stock_codes:
+                                        if not self._has_trading_data(existing_stock):
+                                            stocks_to_delete.append(existing_stock.id)
+                                        else:
+                                            total_stocks_preserved += 1
+                                            logger.debug(
+                                                f"Preserving traded stock not in message: "
+                                                f"stock_code={stock_code}"
+                                            )
+
+                                if stocks_to_delete:
+                                    await session.execute(
+                                        delete(DailyStrategyStockModel).where(
+                                            DailyStrategyStockModel.id.in_(stocks_to_delete)
+                                        )
                                     )
-                                else:
-                                    # 거래 기록 없음 → 전체 업데이트
-                                    existing_stock.stock_name = stock_data.stock_name
-                                    existing_stock.exchange = stock_data.exchange
-                                    existing_stock.stock_open = float(stock_data.stock_open)
-                                    existing_stock.target_price = stock_data.target_price
-                                    existing_stock.target_quantity = stock_data.target_quantity
-                                    existing_stock.target_sell_price = stock_data.target_sell_price
-                                    existing_stock.stop_loss_price = stock_data.stop_loss_price
-                                    total_stocks_updated += 1
-                            else:
-                                # 새 종목 추가
-                                new_stock = DailyStrategyStockModel(
-                                    daily_strategy_id=daily_strategy.id,
-                                    stock_code=stock_data.stock_code,
-                                    stock_name=stock_data.stock_name,
-                                    exchange=stock_data.exchange,
-                                    stock_open=float(stock_data.stock_open),
-                                    target_price=stock_data.target_price,
-                                    target_quantity=stock_data.target_quantity,
-                                    target_sell_price=stock_data.target_sell_price,
-                                    stop_loss_price=stock_data.stop_loss_price,
-                                )
-                                session.add(new_stock)
-                                total_stocks_added += 1
 
-                        updated_strategies += 1
-                        logger.debug(
-                            f"Merged DailyStrategy: "
-                            f"id={daily_strategy.id}, "
-                            f"user_strategy_id={strategy.user_strategy_id}, "
-                            f"preserved={total_stocks_preserved}, "
-                            f"updated={total_stocks_updated}, "
-                            f"added={total_stocks_added}"
-                        )
-                    else:
-                        # 새로 생성
-                        daily_strategy = DailyStrategyModel(
-                            user_strategy_id=strategy.user_strategy_id,
-                            timestamp=message.timestamp,
+                                # 메시지의 각 종목 처리
+                                for stock_data in strategy.stocks:
+                                    existing_stock = existing_stocks.get(stock_data.stock_code)
+
+                                    if existing_stock:
+                                        if self._has_trading_data(existing_stock):
+                                            # 거래 기록 있음 → target 정보만 업데이트, 거래 기록 보존
+                                            updates_preserved.append({
+                                                "id": existing_stock.id,
+                                                "target_price": stock_data.target_price,
+                                                "target_quantity": stock_data.target_quantity,
+                                                "target_sell_price": stock_data.target_sell_price,
+                                                "stop_loss_price": stock_data.stop_loss_price,
+                                            })
+                                            total_stocks_preserved += 1
+                                            logger.debug(
+                                                f"Preserved traded stock: "
+                                                f"stock_code={stock_data.stock_code}, "
+                                                f"buy_price={existing_stock.buy_price}"
+                                            )
+                                        else:
+                                            # 거래 기록 없음 → 전체 업데이트
+                                            updates_full.append({
+                                                "id": existing_stock.id,
+                                                "stock_name": stock_data.stock_name,
+                                                "exchange": stock_data.exchange,
+                                                "stock_open": stock_data.stock_open,
+                                                "target_price": stock_data.target_price,
+                                                "target_quantity": stock_data.target_quantity,
+                                                "target_sell_price": stock_data.target_sell_price,
+                                                "stop_loss_price": stock_data.stop_loss_price,
+                                            })
+                                            total_stocks_updated += 1
+                                    else:
+                                        # 새 종목 추가
+                                        new_stock = DailyStrategyStockModel(
+                                            daily_strategy_id=daily_strategy.id,
+                                            stock_code=stock_data.stock_code,
+                                            stock_name=stock_data.stock_name,
+                                            exchange=stock_data.exchange,
+                                            stock_open=stock_data.stock_open,
+                                            target_price=stock_data.target_price,
+                                            target_quantity=stock_data.target_quantity,
+                                            target_sell_price=stock_data.target_sell_price,
+                                            stop_loss_price=stock_data.stop_loss_price,
+                                        )
+                                        session.add(new_stock)
+                                        total_stocks_added += 1
+
+                                updated_strategies += 1
+                                logger.debug(
+                                    f"Merged DailyStrategy: "
+                                    f"id={daily_strategy.id}, "
+                                    f"user_strategy_id={strategy.user_strategy_id}, "
+                                    f"preserved={total_stocks_preserved}, "
+                                    f"updated={total_stocks_updated}, "
+                                    f"added={total_stocks_added}"
+                                )
+                            else:
+                                # 새로 생성 (루프 종료 후 일괄 INSERT)
+                                new_strategies.append(strategy)
+
+                            total_strategies += 1
+
+                    if updates_preserved:
+                        await session.execute(update(DailyStrategyStockModel), updates_preserved)
+                    if updates_full:
+                        await session.execute(update(DailyStrategyStockModel), updates_full)
+
+                    if new_strategies:
+                        # DailyStrategy 일괄 생성 - RETURNING으로 id를 받아 flush 왕복 제거
+                        result = await session.execute(
+                            insert(DailyStrategyModel).returning(
+                                DailyStrategyModel.id, sort_by_parameter_order=True
+                            ),
+                            [
+                                {
+                                    "user_strategy_id": strategy.user_strategy_id,
+                                    "timestamp": message.timestamp,
+                                }
+                                for strategy in new_strategies
+                            ],
                         )
-                        session.add(daily_strategy)
-                        await session.flush()  # ID를 얻기 위해 flush
-
-                        # DailyStrategyStock 생성
-                        for stock_data in strategy.stocks:
-                            daily_strategy_stock = DailyStrategyStockModel(
-                                daily_strategy_id=daily_strategy.id,
-                                stock_code=stock_data.stock_code,
-                                stock_name=stock_data.stock_name,
-                                exchange=stock_data.exchange,
-                                stock_open=float(stock_data.stock_open),
-                                target_price=stock_data.target_price,
-                                target_quantity=stock_data.target_quantity,
-                                target_sell_price=stock_data.target_sell_price,
-                                stop_loss_price=stock_data.stop_loss_price,
-                            )
-                            session.add(daily_strategy_stock)
-                            total_stocks_added += 1
-
-                        created_strategies += 1
+                        new_ids = result.scalars().all()
+
+                        # DailyStrategyStock 일괄 생성
+                        stock_rows = [
+                            {
+                                "daily_strategy_id": daily_strategy_id,
+                                "stock_code": stock_data.stock_code,
+                                "stock_name": stock_data.stock_name,
+                                "exchange": stock_data.exchange,
+                                "stock_open": stock_data.stock_open,
+                                "target_price": stock_data.target_price,
+                                "target_quantity": stock_data.target_quantity,
+                                "target_sell_price": stock_data.target_sell_price,
+                                "stop_loss_price": stock_data.stop_loss_price,
+                            }
+                            for daily_strategy_id, strategy in zip(new_ids, new_strategies)
+                            for stock_data in strategy.stocks
+                        ]
+                        if stock_rows:
+                            await session.execute(insert(DailyStrategyStockModel), stock_rows)
+
+                        created_strategies = len(new_strategies)
+                        total_stocks_added += len(stock_rows)
                         logger.debug(
-                            f"Creating new DailyStrategy: "
-                            f"id={daily_strategy.id}, user_strategy_id={strategy.user_strategy_id}"
+                            f"Created new DailyStrategy: "
+                            f"ids={list(new_ids)}, "
+                            f"user_strategy_ids={[s.user_strategy_id for s in new_strategies]}"
                         )
 
-                    total_strategies += 1
-
-            # 커밋
-            await session.commit()
-
             logger.info(
                 f"Successfully saved daily strategy: "
                 f"{total_strategies} strategies "
@@ -222,16 +270,11 @@ class DailyStrategyHandler:
             )
 
         except Exception as e:
-            if session:
-                await session.rollback()
             logger.error(
                 f"Error processing daily strategy message: {e}",
                 exc_info=True
             )
             raise
-        finally:
-            if session:
-                await session.close()
 
 
 # 싱글톤 인스턴스
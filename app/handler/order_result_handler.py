@@ -6,16 +6,21 @@
 
 import logging
 import asyncio
-from typing import Optional
-from datetime import datetime
-
-from sqlalchemy import select, func
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import bindparam, select, func, insert, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.config.db_connections import get_session_factory
-from app.schemas.order_signal import OrderResultMessage
+from app.schemas.order_signal import OrderResultMessage, OrderResultStatus, OrderSide
 from app.repositories.stock_repository import StockRepository
+from app.repositories.account_repository import AccountRepository
 from app.services.kis_service import KISService
 from app.database.database.strategy import (
     DailyStrategy as DailyStrategyModel,
@@ -25,262 +30,680 @@ from app.database.database.strategy import (
     OrderStatus,
     OrderType,
 )
-from app.database.database.users import AccountType
+from app.database.database.users import Accounts, AccountType
 from app.utils.rate_limiter import get_account_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# 메시지 enum → DB enum 매핑 (문자열 비교 대신 dict 조회)
+ORDER_TYPE_MAP = {
+    OrderSide.BUY: OrderType.BUY,
+    OrderSide.SELL: OrderType.SELL,
+}
+ORDER_STATUS_MAP = {
+    OrderResultStatus.ORDERED: OrderStatus.ORDERED,
+    OrderResultStatus.PARTIALLY_EXECUTED: OrderStatus.PARTIALLY_EXECUTED,
+    OrderResultStatus.EXECUTED: OrderStatus.EXECUTED,
+}
+
+# 일일 전략 종목 id 캐시 설정 - (user_strategy_id, 날짜, 종목코드) → daily_strategy_stock_id
+STRATEGY_STOCK_CACHE_TTL = 60.0  # 초
+STRATEGY_STOCK_CACHE_MAXSIZE = 1024
+
+# 메시지 단위 재시도 backoff - full jitter 지수 backoff (동시 재시도 분산)
+RETRY_BACKOFF_BASE = 0.05  # 초
+RETRY_BACKOFF_MAX = 1.0  # 초
+
+# 예수금 갱신 지연 시간 - 이 시간 동안 커밋된 연속 체결을 KIS 조회 1회로 합침
+ACCOUNT_BALANCE_REFRESH_DEBOUNCE = 0.2  # 초
+# KIS 액세스 토큰 캐시 만료 여유 - 만료 직전 토큰은 재발급
+KIS_TOKEN_EXPIRY_MARGIN = timedelta(minutes=1)
+
+# 중복 메시지 캐시 설정 - (order_no, status, 이번 체결수량, 누적 체결수량) 기준
+DUPLICATE_CACHE_TTL = 30.0  # 초
+DUPLICATE_CACHE_MAXSIZE = 4096
+
+# order_no별 트랜잭션 advisory lock (커밋/롤백 시 자동 해제)
+# 키는 서버측 hashtext로 계산 (프로세스마다 달라지는 Python hash() 사용 불가)
+_ORDER_ADVISORY_LOCK_STMT = text("SELECT pg_advisory_xact_lock(hashtext(:order_no))")
+
+# DailyStrategy 합계에 종목 변경분(delta)을 원자적으로 더함
+# 갱신된 합계는 호출자가 RETURNING row로 읽음 (SQL 식으로 갱신된 ORM 속성은
+# 세션 동기화 시 만료되어 async 세션에서 lazy load 불가)
+# 바인드 이름은 컬럼명과 겹치지 않게 지정 (겹치면 SET 절에 추가됨)
+_APPLY_STRATEGY_DELTA_STMT = (
+    update(DailyStrategyModel)
+    .where(DailyStrategyModel.id == bindparam("ds_id"))
+    .values(
+        buy_amount=func.coalesce(DailyStrategyModel.buy_amount, 0) + bindparam("buy_delta"),
+        sell_amount=func.coalesce(DailyStrategyModel.sell_amount, 0) + bindparam("sell_delta"),
+        total_profit_amount=(
+            func.coalesce(DailyStrategyModel.total_profit_amount, 0) + bindparam("profit_delta")
+        ),
+    )
+    .returning(
+        DailyStrategyModel.buy_amount,
+        DailyStrategyModel.sell_amount,
+        DailyStrategyModel.total_profit_amount,
+    )
+)
+
+# MOCK 계좌 잔액에 체결 금액을 원자적으로 가감 (갱신된 잔액은 호출자가 RETURNING으로 읽음)
+_APPLY_MOCK_BALANCE_DELTA_STMT = (
+    update(Accounts)
+    .where(Accounts.id == bindparam("account_id"))
+    .values(account_balance=func.coalesce(Accounts.account_balance, 0) + bindparam("balance_delta"))
+    .returning(Accounts.account_balance)
+)
+
+
+def _next_execution_sequence(order_id: int, offset: int):
+    """
+    체결 순서 서버측 계산식: 기존 MAX(execution_sequence) + offset
+
+    한 INSERT 안의 서브쿼리는 모두 같은 스냅샷을 보므로, 같은 주문의 체결이
+    여러 건 함께 INSERT될 때는 offset(1, 2, ...)으로 순서를 구분
+    """
+    return (
+        select(func.coalesce(func.max(OrderExecutionModel.execution_sequence), 0) + offset)
+        .where(OrderExecutionModel.order_id == order_id)
+        .scalar_subquery()
+    )
+
+
+# order_no로 기존 Order 조회 (주문 접수 캐시 hit 시 컨텍스트 조회 대신 사용)
+# orders.order_no에 unique 제약이 아직 없어 ON CONFLICT UPSERT 불가 →
+# advisory lock으로 직렬화한 뒤 조회 결과에 따라 INSERT/UPDATE
+_ORDER_BY_NO_STMT = (
+    select(OrderModel)
+    .where(OrderModel.order_no == bindparam("order_no"))
+)
+
 
 class OrderResultHandler:
     """주문 결과 메시지 핸들러"""
 
     def __init__(self):
         self._session_factory = get_session_factory()
-        # order_no별 처리 lock - 같은 주문의 체결통보를 순차 처리
-        self._order_locks: dict[str, asyncio.Lock] = {}
+        # 일일 전략 종목 id TTL 캐시 (주문 접수 메시지의 컨텍스트 조회 생략용)
+        self._stock_id_cache: Dict[Tuple[int, date, str], Tuple[float, int]] = {}
+        # 계좌별 최근 KIS 예수금: account_id → (조회 시작 시각, 예수금)
+        # 갱신 요청 이후에 시작된 조회가 있으면 그 결과에 체결이 반영되어 있으므로 재조회 생략
+        self._balance_cache: Dict[int, Tuple[float, int]] = {}
+        # 계좌별 KIS 액세스 토큰 캐시: account_id → (토큰, 만료 시각)
+        # 갱신은 계좌별 1개 태스크에서만 수행되므로 별도 Lock 불필요
+        self._token_cache: Dict[int, Tuple[str, datetime]] = {}
+        # 계좌별 KIS 클라이언트 (HTTP keep-alive/TLS 세션 재사용, 종료 시 close)
+        self._kis_services: Dict[int, KISService] = {}
+        # 커밋 후 KIS 예수금을 갱신할 계좌 id 및 진행 중인 갱신 태스크 (계좌별 1개)
+        self._balance_refresh_accounts: Set[int] = set()
+        self._balance_refresh_tasks: Dict[int, asyncio.Task] = {}
+        # 갱신 태스크 진행 중에 커밋된 체결이 있는 계좌 → 최근 요청 시각 (태스크 종료 시 다시 갱신)
+        self._balance_refresh_pending: Dict[int, float] = {}
+        # 처리 완료 메시지 키 → 만료 시각 (재전송 메시지는 DB 작업 전에 제외)
+        self._processed_messages: OrderedDict[Tuple[str, str, int, int], float] = OrderedDict()
+        # 누적 체결수량이 DB보다 작아 버린 지연(stale) 체결통보 수
+        self._stale_message_drops: int = 0
+        # 상태별 처리 함수
+        self._status_handlers = {
+            OrderResultStatus.ORDERED: self._handle_ordered,
+            OrderResultStatus.PARTIALLY_EXECUTED: self._handle_executed,
+            OrderResultStatus.EXECUTED: self._handle_executed,
+        }
+
+    @staticmethod
+    def _message_key(message: OrderResultMessage) -> Tuple[str, str, int, int]:
+        """중복 판별 키"""
+        return (
+            message.order_no,
+            message.status,
+            message.executed_quantity,
+            message.total_executed_quantity,
+        )
 
-    def _get_order_lock(self, order_no: str) -> asyncio.Lock:
-        """주문번호별 Lock 반환 (없으면 생성)"""
-        if order_no not in self._order_locks:
-            self._order_locks[order_no] = asyncio.Lock()
-        return self._order_locks[order_no]
+    def _is_duplicate(self, message: OrderResultMessage) -> bool:
+        """TTL 내에 이미 처리(커밋)된 메시지인지 확인"""
+        key = self._message_key(message)
+        expires_at = self._processed_messages.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            self._processed_messages.pop(key, None)
+            return False
+        return True
+
+    def _mark_processed(self, messages: List[OrderResultMessage]) -> None:
+        """커밋된 메시지 기록 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        expires_at = time.monotonic() + DUPLICATE_CACHE_TTL
+        for message in messages:
+            key = self._message_key(message)
+            self._processed_messages.pop(key, None)
+            self._processed_messages[key] = expires_at
+        while len(self._processed_messages) > DUPLICATE_CACHE_MAXSIZE:
+            self._processed_messages.popitem(last=False)
+
+    async def _get_kis_service(self, account, is_paper: bool) -> KISService:
+        """계좌별 KIS 클라이언트 반환 (없거나 앱키가 바뀌었으면 새로 생성)"""
+        kis = self._kis_services.get(account.id)
+        if (
+            kis is None
+            or kis.app_key != account.app_key
+            or kis.app_secret != account.app_secret
+            or kis.is_paper != is_paper
+        ):
+            if kis is not None:
+                await kis.aclose()
+            kis = KISService(
+                account.app_key, account.app_secret, is_paper=is_paper,
+                client=httpx.AsyncClient(),
+            )
+            self._kis_services[account.id] = kis
+        return kis
+
+    def _get_cached_token(self, account_id: int) -> Optional[str]:
+        """캐시된 KIS 액세스 토큰 반환 (없거나 만료 임박 시 None)"""
+        entry = self._token_cache.get(account_id)
+        if entry is None:
+            return None
+        token, expired_at = entry
+        if expired_at - KIS_TOKEN_EXPIRY_MARGIN <= datetime.now(timezone.utc):
+            self._token_cache.pop(account_id, None)
+            return None
+        return token
+
+    def _set_cached_token(self, account_id: int, token: Optional[str], expired_at: Optional[datetime]) -> None:
+        """KIS 액세스 토큰 캐시 저장 (만료 시각을 모르면 저장하지 않음)"""
+        if not token or expired_at is None:
+            return
+        if expired_at.tzinfo is None:
+            expired_at = expired_at.replace(tzinfo=timezone.utc)
+        self._token_cache[account_id] = (token, expired_at)
+
+    def _get_cached_stock_id(self, key: Tuple[int, date, str]) -> Optional[int]:
+        """캐시된 daily_strategy_stock_id 반환 (없거나 만료 시 None)"""
+        entry = self._stock_id_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, stock_id = entry
+        if expires_at < time.monotonic():
+            self._stock_id_cache.pop(key, None)
+            return None
+        return stock_id
+
+    def _set_cached_stock_id(self, key: Tuple[int, date, str], stock_id: int) -> None:
+        """daily_strategy_stock_id 캐시 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        self._stock_id_cache.pop(key, None)
+        if len(self._stock_id_cache) >= STRATEGY_STOCK_CACHE_MAXSIZE:
+            self._stock_id_cache.pop(next(iter(self._stock_id_cache)))
+        self._stock_id_cache[key] = (time.monotonic() + STRATEGY_STOCK_CACHE_TTL, stock_id)
+
+    async def handle_order_results(self, messages: List[OrderResultMessage]) -> None:
+        """
+        주문 결과 메시지 배치를 하나의 트랜잭션으로 저장
 
-    def _cleanup_order_lock(self, order_no: str) -> None:
-        """완료된 주문의 Lock 정리"""
-        self._order_locks.pop(order_no, None)
+        consumer가 한 번에 가져온 메시지 단위로 호출하고 처리 완료 후 offset을 커밋하므로,
+        처리 전에 비정상 종료된 메시지는 재시작 시 다시 수신됨.
+        consumer가 처리 완료를 기다리므로 DB 동시 사용은 커넥션 1개로 제한되고,
+        처리 속도보다 유입이 빠르면 다음 메시지 수신이 대기 (backpressure).
 
-    async def handle_order_result(self, message: OrderResultMessage, max_retries: int = 5) -> None:
+        Raises:
+            재시도 후에도 저장하지 못한 메시지가 있으면 마지막 예외 (consumer에서 로깅)
         """
-        주문 결과 메시지 처리 및 데이터베이스 저장
+        pending: List[OrderResultMessage] = []
+        for message in messages:
+            # 메시지마다 호출되는 로그는 lazy % 포맷 사용 (레벨 필터 시 포맷 비용 없음)
+            # 수신 로그는 consumer에서 INFO로 남기므로 여기서는 DEBUG
+            logger.debug(
+                "Processing order result message: order_no=%s, status=%s, "
+                "user_strategy_id=%s, total_executed_quantity=%s",
+                message.order_no, message.status,
+                message.user_strategy_id, message.total_executed_quantity,
+            )
+
+            # 최근 처리한 메시지의 재전송(재연결/재처리 등)은 DB 작업 없이 제외
+            if self._is_duplicate(message):
+                logger.debug(
+                    "Skipping duplicate order result message: order_no=%s, status=%s",
+                    message.order_no, message.status,
+                )
+                continue
+            pending.append(message)
+
+        if pending:
+            await self._process_batch(pending)
 
-        같은 order_no에 대한 메시지를 asyncio.Lock으로 직렬화하여
-        DB row-level lock 경합 없이 순차 처리.
+    async def close(self) -> None:
+        """진행 중인 예수금 갱신 완료 대기 후 KIS 클라이언트 종료 (앱 종료 시 호출)"""
+        # 종료 콜백이 대기 중인 갱신을 다시 시작할 수 있으므로 남은 태스크가 없을 때까지 대기
+        while self._balance_refresh_tasks:
+            await asyncio.gather(*self._balance_refresh_tasks.values(), return_exceptions=True)
+
+        for kis in self._kis_services.values():
+            await kis.aclose()
+        self._kis_services.clear()
+
+    async def _process_batch(self, messages: List[OrderResultMessage]) -> None:
         """
-        logger.info(
-            f"Processing order result message: order_no={message.order_no}, "
-            f"status={message.status}, user_strategy_id={message.user_strategy_id}, "
-            f"total_executed_quantity={message.total_executed_quantity}"
-        )
+        메시지 배치를 하나의 트랜잭션으로 처리
 
-        # 같은 주문번호에 대한 메시지를 순차 처리
-        lock = self._get_order_lock(message.order_no)
-        async with lock:
-            for attempt in range(max_retries):
-                try:
-                    await self._process_order_result(message)
-                    # 전량 체결 완료 시 lock 정리
-                    if message.is_fully_executed:
-                        self._cleanup_order_lock(message.order_no)
-                    return
-                except IntegrityError as e:
-                    logger.warning(
-                        f"IntegrityError on attempt {attempt + 1}/{max_retries} "
-                        f"for order_no={message.order_no}: {e}"
-                    )
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(0.1 * (attempt + 1))
-                    else:
-                        logger.error(
-                            f"Failed to process order result after {max_retries} attempts: "
-                            f"order_no={message.order_no}"
-                        )
-                        raise
-                except Exception as e:
-                    logger.error(
-                        f"Error processing order result (attempt {attempt + 1}/{max_retries}): "
-                        f"order_no={message.order_no}, error={e}",
-                        exc_info=True
-                    )
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(0.1 * (attempt + 1))
-                    else:
-                        raise
+        메시지별 SAVEPOINT로 실패한 메시지만 되돌리고, 실패 메시지 및
+        배치 커밋 실패 시에는 메시지 단위 재시도로 fallback.
+        실패한 주문의 이후 메시지는 배치에서 반영하지 않고 재시도 경로로 넘겨
+        같은 order_no의 메시지가 수신 순서대로 반영되도록 유지.
+        재시도까지 실패한 메시지가 있으면 나머지를 모두 처리한 뒤 마지막 예외를 다시 발생.
+        """
+        failed: List[OrderResultMessage] = []
+        # 배치 안에서 실패한 메시지가 있는 order_no
+        failed_orders: Set[str] = set()
 
-    async def _process_order_result(self, message: OrderResultMessage) -> None:
-        """실제 주문 결과 처리 로직"""
-        session: Optional[AsyncSession] = None
         try:
-            session = self._session_factory()
-            stock_repository = StockRepository(session)
+            async with self._session_factory() as session:
+                # 레포지토리는 세션 단위로 한 번만 생성해 배치 내 메시지가 공유
+                stock_repository = StockRepository(session)
+
+                # 체결 row는 모아서 배치 끝에 한 번에 INSERT
+                execution_rows: List[dict] = []
+
+                for message in messages:
+                    if message.order_no in failed_orders:
+                        # 앞선 메시지가 재시도 대기 중 → 순서 유지를 위해 함께 재시도
+                        failed.append(message)
+                        continue
+
+                    try:
+                        async with session.begin_nested():
+                            execution_row = await self._apply_order_result(
+                                session, stock_repository, message
+                            )
+                    except Exception as e:
+                        logger.warning(
+                            "Order result failed in batch, will retry individually: "
+                            "order_no=%s, error=%s",
+                            message.order_no, e,
+                        )
+                        failed.append(message)
+                        failed_orders.add(message.order_no)
+                        continue
 
-            # timestamp를 datetime으로 변환
-            if isinstance(message.timestamp, str):
-                timestamp = datetime.fromisoformat(message.timestamp.replace('Z', '+00:00'))
-            else:
-                timestamp = message.timestamp
+                    if execution_row:
+                        execution_rows.append(execution_row)
+
+                if execution_rows:
+                    await self._insert_executions(session, execution_rows)
+
+                await session.commit()
 
-            # DailyStrategyStock 찾기
-            order_date = timestamp.date()
-            daily_strategy = await stock_repository.get_daily_strategy_with_stocks(
-                message.user_strategy_id, order_date
+            # 커밋된 메시지만 기록 (실패 메시지는 아래 재시도 성공 시 기록)
+            failed_ids = {id(message) for message in failed}
+            self._mark_processed([m for m in messages if id(m) not in failed_ids])
+
+            logger.info(
+                "Committed order result batch: size=%s, failed=%s",
+                len(messages), len(failed),
             )
+        except Exception as e:
+            logger.error(
+                "Order result batch commit failed, falling back to per-message: "
+                "size=%s, error=%s",
+                len(messages), e,
+                exc_info=True
+            )
+            failed = messages
 
-            if not daily_strategy:
-                logger.warning(
-                    f"DailyStrategy not found: user_strategy_id={message.user_strategy_id}, "
-                    f"date={order_date}"
-                )
-                return
+        # 수신 순서대로 재시도 (같은 order_no의 누적 체결이 역순으로 반영되지 않도록)
+        error: Optional[Exception] = None
+        for message in failed:
+            try:
+                await self._process_with_retry(message)
+            except Exception as e:
+                # 재시도 로직에서 order_no와 함께 로깅됨, traceback은 consumer에서 로깅
+                error = e
 
-            # 해당 종목 찾기
-            daily_strategy_stock = None
-            for stock in daily_strategy.stocks:
-                if stock.stock_code == message.stock_code:
-                    daily_strategy_stock = stock
-                    break
+        self._schedule_balance_refreshes()
 
-            if not daily_strategy_stock:
-                logger.warning(
-                    f"DailyStrategyStock not found: stock_code={message.stock_code}, "
-                    f"daily_strategy_id={daily_strategy.id}"
-                )
-                return
+        if error is not None:
+            raise error
 
-            # 주문번호로 기존 Order 조회
-            stmt = select(OrderModel).where(
-                OrderModel.order_no == message.order_no
-            ).with_for_update()
-            result = await session.execute(stmt)
-            existing_order = result.scalar_one_or_none()
+    async def _process_with_retry(self, message: OrderResultMessage, max_retries: int = 5) -> None:
+        """
+        메시지 단위 처리 (재시도 포함)
 
-            if message.status == "ordered":
-                # 주문 접수: Order 테이블에 새 레코드 생성
-                if existing_order:
+        consumer가 배치를 순차 처리하므로 프로세스 내 경합은 없고, 다른 프로세스와의
+        경합은 advisory lock으로 직렬화되므로 재시도는 일시적 DB 오류에 대해서만 수행.
+        """
+        for attempt in range(max_retries):
+            try:
+                await self._process_order_result(message)
+                self._mark_processed([message])
+                return
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    # 재시도 가능한 실패는 traceback 없이 경고만
                     logger.warning(
-                        f"Order already exists: order_no={message.order_no}, updating..."
+                        "Error processing order result (attempt %s/%s): order_no=%s, error=%s",
+                        attempt + 1, max_retries, message.order_no, e,
+                    )
+                    await asyncio.sleep(
+                        random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
                     )
-                    existing_order.order_quantity = message.order_quantity
-                    existing_order.order_price = message.order_price
-                    existing_order.order_dvsn = message.order_dvsn
-                    existing_order.status = OrderStatus.ORDERED
-                    existing_order.total_executed_quantity = 0
-                    existing_order.total_executed_price = 0.0
-                    existing_order.remaining_quantity = message.order_quantity
-                    existing_order.is_fully_executed = False
-                    existing_order.ordered_at = timestamp
                 else:
-                    new_order = OrderModel(
-                        daily_strategy_stock_id=daily_strategy_stock.id,
-                        order_no=message.order_no,
-                        order_type=OrderType.BUY if message.order_type == "BUY" else OrderType.SELL,
-                        order_quantity=message.order_quantity,
-                        order_price=message.order_price,
-                        order_dvsn=message.order_dvsn,
-                        account_no=message.account_no,
-                        is_mock=message.is_mock,
-                        status=OrderStatus.ORDERED,
-                        total_executed_quantity=0,
-                        total_executed_price=0.0,
-                        remaining_quantity=message.order_quantity,
-                        is_fully_executed=False,
-                        ordered_at=timestamp,
+                    logger.error(
+                        "Failed to process order result after %s attempts: order_no=%s, error=%s",
+                        max_retries, message.order_no, e,
                     )
-                    session.add(new_order)
-                    logger.info(
-                        f"Created new order: order_no={message.order_no}, "
-                        f"order_type={message.order_type}, quantity={message.order_quantity}"
+                    raise
+
+    async def _process_order_result(self, message: OrderResultMessage) -> None:
+        """단일 메시지 처리 (별도 세션 + 커밋, 예외 로깅은 호출자가 담당)"""
+        # 세션 컨텍스트: 종료 시 close (미커밋 트랜잭션은 롤백 후 커넥션 반환)
+        async with self._session_factory() as session:
+            execution_row = await self._apply_order_result(
+                session, StockRepository(session), message
+            )
+            if execution_row:
+                await self._insert_executions(session, [execution_row])
+            await session.commit()
+        logger.info("Successfully processed order result: order_no=%s", message.order_no)
+
+    async def _apply_order_result(
+        self,
+        session: AsyncSession,
+        stock_repository: StockRepository,
+        message: OrderResultMessage,
+    ) -> Optional[dict]:
+        """
+        실제 주문 결과 처리 로직 (커밋은 호출자가 담당)
+
+        Returns:
+            체결통보인 경우 INSERT할 OrderExecution row (호출자가 _insert_executions로 저장)
+        """
+        # timestamp는 스키마 파싱 시 datetime으로 변환됨
+        timestamp = message.timestamp
+
+        order_date = timestamp.date()
+        cache_key = (message.user_strategy_id, order_date, message.stock_code)
+
+        # 주문 접수는 종목 id만 필요 → 캐시 hit 시 컨텍스트 조회 없이 Order만 조회 후 저장
+        # (체결통보는 전략/종목 상태를 갱신하므로 항상 DB에서 조회)
+        if message.status == OrderResultStatus.ORDERED:
+            cached_stock_id = self._get_cached_stock_id(cache_key)
+            if cached_stock_id is not None:
+                try:
+                    await session.execute(
+                        _ORDER_ADVISORY_LOCK_STMT, {"order_no": message.order_no}
                     )
-            else:
-                # 체결통보: 기존 Order 업데이트 및 OrderExecution 생성
-                if not existing_order:
-                    logger.warning(
-                        f"Order not found for execution: order_no={message.order_no}, "
-                        f"creating order first..."
+                    result = await session.execute(
+                        _ORDER_BY_NO_STMT, {"order_no": message.order_no}
                     )
-                    existing_order = OrderModel(
-                        daily_strategy_stock_id=daily_strategy_stock.id,
-                        order_no=message.order_no,
-                        order_type=OrderType.BUY if message.order_type == "BUY" else OrderType.SELL,
-                        order_quantity=message.order_quantity,
-                        order_price=message.order_price,
-                        order_dvsn=message.order_dvsn,
-                        account_no=message.account_no,
-                        is_mock=message.is_mock,
-                        status=OrderStatus.PARTIALLY_EXECUTED if message.status == "partially_executed" else OrderStatus.EXECUTED,
-                        total_executed_quantity=message.total_executed_quantity,
-                        total_executed_price=message.total_executed_price,
-                        remaining_quantity=message.remaining_quantity,
-                        is_fully_executed=message.is_fully_executed,
-                        ordered_at=timestamp,
+                    await self._save_ordered_order(
+                        session, message, timestamp, cached_stock_id,
+                        result.scalar_one_or_none(),
                     )
-                    session.add(existing_order)
-                    await session.flush()
-                else:
-                    # 누적 체결수량이 DB보다 큰 경우에만 업데이트 (idempotent)
-                    if message.total_executed_quantity >= (existing_order.total_executed_quantity or 0):
-                        existing_order.status = (
-                            OrderStatus.PARTIALLY_EXECUTED
-                            if message.status == "partially_executed"
-                            else OrderStatus.EXECUTED
-                        )
-                        existing_order.total_executed_quantity = message.total_executed_quantity
-                        existing_order.total_executed_price = message.total_executed_price
-                        existing_order.remaining_quantity = message.remaining_quantity
-                        existing_order.is_fully_executed = message.is_fully_executed
-                    else:
-                        logger.warning(
-                            f"Skipping stale message: order_no={message.order_no}, "
-                            f"msg_total={message.total_executed_quantity}, "
-                            f"db_total={existing_order.total_executed_quantity}"
-                        )
+                except Exception:
+                    # 종목이 삭제/변경되었을 수 있으므로 캐시 제거 후 재시도 시 DB 조회
+                    self._stock_id_cache.pop(cache_key, None)
+                    raise
+                return None
+
+        # 같은 order_no를 처리하는 다른 트랜잭션(다른 인스턴스 포함)과 직렬화
+        # row lock(FOR UPDATE)과 달리 아직 없는 Order에도 걸 수 있어 조회 후 INSERT 경합 없음
+        await session.execute(_ORDER_ADVISORY_LOCK_STMT, {"order_no": message.order_no})
+
+        # DailyStrategy / DailyStrategyStock / 기존 Order 한 번에 조회
+        # (같은 order_no는 advisory lock으로 직렬화되므로 FOR UPDATE 불필요)
+        daily_strategy, daily_strategy_stock, existing_order = (
+            await stock_repository.get_order_context(
+                message.order_no,
+                message.user_strategy_id,
+                order_date,
+                message.stock_code,
+            )
+        )
 
-                # 체결 순서 계산 (count 기반으로 중복 sequence 방지)
-                count_stmt = select(func.count()).select_from(OrderExecutionModel).where(
-                    OrderExecutionModel.order_id == existing_order.id
-                )
-                count_result = await session.execute(count_stmt)
-                execution_count = count_result.scalar() or 0
-                execution_sequence = execution_count + 1
-
-                # OrderExecution 생성
-                new_execution = OrderExecutionModel(
-                    order_id=existing_order.id,
-                    execution_sequence=execution_sequence,
-                    executed_quantity=message.executed_quantity,
-                    executed_price=message.executed_price,
-                    total_executed_quantity_after=message.total_executed_quantity,
-                    total_executed_price_after=message.total_executed_price,
-                    remaining_quantity_after=message.remaining_quantity,
-                    is_fully_executed_after=message.is_fully_executed,
-                    executed_at=timestamp,
-                )
-                session.add(new_execution)
-                logger.info(
-                    f"Created order execution: order_no={message.order_no}, "
-                    f"sequence={execution_sequence}, "
-                    f"executed_quantity={message.executed_quantity}, "
-                    f"total_executed_quantity={message.total_executed_quantity}"
-                )
+        if not daily_strategy:
+            logger.warning(
+                "DailyStrategy not found: user_strategy_id=%s, date=%s",
+                message.user_strategy_id, order_date,
+            )
+            return None
 
-                # 체결 시마다 DailyStrategyStock 업데이트 (부분 체결 포함)
-                await self._update_daily_strategy_stock(
-                    session,
-                    daily_strategy_stock,
-                    daily_strategy,
-                    existing_order,
-                    message.order_type
-                )
-                # 체결분만큼 Account balance 반영 (이번 체결 delta만)
-                await self._update_account_balance_on_execution(
-                    session,
-                    daily_strategy,
-                    existing_order,
-                    message.order_type,
-                    executed_quantity=message.executed_quantity,
-                    executed_price=message.executed_price,
+        if not daily_strategy_stock:
+            logger.warning(
+                "DailyStrategyStock not found: stock_code=%s, daily_strategy_id=%s",
+                message.stock_code, daily_strategy.id,
+            )
+            return None
+
+        self._set_cached_stock_id(cache_key, daily_strategy_stock.id)
+
+        return await self._status_handlers[message.status](
+            session, message, timestamp, daily_strategy, daily_strategy_stock, existing_order
+        )
+
+    async def _handle_ordered(
+        self,
+        session: AsyncSession,
+        message: OrderResultMessage,
+        timestamp: datetime,
+        daily_strategy: DailyStrategyModel,
+        daily_strategy_stock: DailyStrategyStockModel,
+        existing_order: Optional[OrderModel],
+    ) -> None:
+        """주문 접수 처리 (체결 row 없음)"""
+        if existing_order:
+            logger.warning(
+                "Order already exists: order_no=%s, updating...", message.order_no
+            )
+
+        await self._save_ordered_order(
+            session, message, timestamp, daily_strategy_stock.id, existing_order
+        )
+
+        if not existing_order:
+            logger.info(
+                "Created new order: order_no=%s, order_type=%s, quantity=%s",
+                message.order_no, message.order_type, message.order_quantity,
+            )
+
+    async def _save_ordered_order(
+        self,
+        session: AsyncSession,
+        message: OrderResultMessage,
+        timestamp: datetime,
+        daily_strategy_stock_id: int,
+        existing_order: Optional[OrderModel],
+    ) -> None:
+        """
+        주문 접수 Order 저장 (있으면 주문 정보 갱신, 없으면 생성)
+
+        호출 전 order_no advisory lock을 잡아 조회와 INSERT 사이 경합 없음
+        """
+        if existing_order:
+            existing_order.order_quantity = message.order_quantity
+            existing_order.order_price = message.order_price
+            existing_order.order_dvsn = message.order_dvsn
+            existing_order.status = ORDER_STATUS_MAP[message.status]
+            existing_order.total_executed_quantity = 0
+            existing_order.total_executed_price = 0.0
+            existing_order.remaining_quantity = message.order_quantity
+            existing_order.is_fully_executed = False
+            existing_order.ordered_at = timestamp
+            return
+
+        session.add(OrderModel(
+            daily_strategy_stock_id=daily_strategy_stock_id,
+            order_no=message.order_no,
+            order_type=ORDER_TYPE_MAP[message.order_type],
+            order_quantity=message.order_quantity,
+            order_price=message.order_price,
+            order_dvsn=message.order_dvsn,
+            account_no=message.account_no,
+            is_mock=message.is_mock,
+            status=ORDER_STATUS_MAP[message.status],
+            total_executed_quantity=0,
+            total_executed_price=0.0,
+            remaining_quantity=message.order_quantity,
+            is_fully_executed=False,
+            ordered_at=timestamp,
+        ))
+
+    async def _handle_executed(
+        self,
+        session: AsyncSession,
+        message: OrderResultMessage,
+        timestamp: datetime,
+        daily_strategy: DailyStrategyModel,
+        daily_strategy_stock: DailyStrategyStockModel,
+        existing_order: Optional[OrderModel],
+    ) -> Optional[dict]:
+        """
+        체결통보 처리: 기존 Order 업데이트 후 INSERT할 OrderExecution row 반환
+
+        이미 반영된 체결(중복/지연 메시지)이면 아무것도 갱신하지 않고 None 반환
+        """
+        # 이번 처리에서 Order가 새로 생성되었는지 (생성 직후면 이전 체결 없음)
+        is_new_order = False
+        if not existing_order:
+            logger.warning(
+                "Order not found for execution: order_no=%s, creating order first...",
+                message.order_no,
+            )
+            existing_order = OrderModel(
+                daily_strategy_stock_id=daily_strategy_stock.id,
+                order_no=message.order_no,
+                order_type=ORDER_TYPE_MAP[message.order_type],
+                order_quantity=message.order_quantity,
+                order_price=message.order_price,
+                order_dvsn=message.order_dvsn,
+                account_no=message.account_no,
+                is_mock=message.is_mock,
+                status=ORDER_STATUS_MAP[message.status],
+                total_executed_quantity=message.total_executed_quantity,
+                total_executed_price=message.total_executed_price,
+                remaining_quantity=message.remaining_quantity,
+                is_fully_executed=message.is_fully_executed,
+                ordered_at=timestamp,
+            )
+            session.add(existing_order)
+            # advisory lock 하에서 조회 결과 없음 → 생성 후 flush로 id 확보
+            await session.flush()
+            is_new_order = True
+        else:
+            # 누적 체결수량이 DB보다 큰 경우에만 업데이트 (idempotent)
+            if message.total_executed_quantity >= (existing_order.total_executed_quantity or 0):
+                if (
+                    message.total_executed_quantity == existing_order.total_executed_quantity
+                    and message.total_executed_price == existing_order.total_executed_price
+                ):
+                    # 누적 체결 정보가 DB와 동일한 재전송 → 이미 반영된 체결이므로
+                    # 체결 row / 종목·전략 합계 / 계좌 잔액 갱신 모두 생략
+                    logger.debug(
+                        "Execution already applied, skipping: order_no=%s, total=%s",
+                        message.order_no, message.total_executed_quantity,
+                    )
+                    return None
+                existing_order.status = ORDER_STATUS_MAP[message.status]
+                existing_order.total_executed_quantity = message.total_executed_quantity
+                existing_order.total_executed_price = message.total_executed_price
+                existing_order.remaining_quantity = message.remaining_quantity
+                existing_order.is_fully_executed = message.is_fully_executed
+            else:
+                # 메시지에 별도 순번이 없으므로 누적 체결수량을 순번으로 사용
+                self._stale_message_drops += 1
+                logger.warning(
+                    "Dropping stale execution message: order_no=%s, status=%s, "
+                    "msg_total=%s, db_total=%s, executed_quantity=%s, dropped=%d",
+                    message.order_no, message.status, message.total_executed_quantity,
+                    existing_order.total_executed_quantity, message.executed_quantity,
+                    self._stale_message_drops,
                 )
+                # 체결 row / 종목·전략 합계 / 계좌 잔액(KIS 조회 포함) 갱신 모두 생략
+                return None
+
+        # 체결 시마다 DailyStrategyStock 업데이트 (부분 체결 포함)
+        await self._update_daily_strategy_stock(
+            session,
+            daily_strategy_stock,
+            daily_strategy,
+            existing_order,
+            message.order_type
+        )
+        # 체결분만큼 Account balance 반영 (이번 체결 delta만)
+        await self._update_account_balance_on_execution(
+            session,
+            daily_strategy,
+            existing_order,
+            message.order_type,
+            executed_quantity=message.executed_quantity,
+            executed_price=message.executed_price,
+        )
 
-            await session.commit()
-            logger.info(f"Successfully processed order result: order_no={message.order_no}")
+        return {
+            "is_new_order": is_new_order,
+            "order_id": existing_order.id,
+            "executed_quantity": message.executed_quantity,
+            "executed_price": message.executed_price,
+            "total_executed_quantity_after": message.total_executed_quantity,
+            "total_executed_price_after": message.total_executed_price,
+            "remaining_quantity_after": message.remaining_quantity,
+            "is_fully_executed_after": message.is_fully_executed,
+            "executed_at": timestamp,
+        }
+
+    async def _insert_executions(self, session: AsyncSession, rows: List[dict]) -> None:
+        """
+        OrderExecution 일괄 INSERT (multi-row VALUES 한 번)
 
-        except Exception as e:
-            logger.error(f"Error processing order result: {e}", exc_info=True)
-            if session:
-                await session.rollback()
-            raise
-        finally:
-            if session:
-                await session.close()
+        체결 순서는 INSERT 안에서 서버측 MAX + offset으로 계산 (별도 조회 왕복 없음)
+        """
+        offsets: Dict[int, int] = {}
+        values = []
+        for row in rows:
+            row = dict(row)
+            is_new_order = row.pop("is_new_order", False)
+            order_id = row["order_id"]
+            offsets[order_id] = offsets.get(order_id, 0) + 1
+            # 방금 생성된 주문은 이전 체결이 없으므로 서브쿼리 없이 순서 확정
+            row["execution_sequence"] = (
+                offsets[order_id]
+                if is_new_order
+                else _next_execution_sequence(order_id, offsets[order_id])
+            )
+            values.append(row)
+
+        result = await session.execute(
+            insert(OrderExecutionModel)
+            .values(values)
+            .returning(
+                OrderExecutionModel.order_id,
+                OrderExecutionModel.execution_sequence,
+                OrderExecutionModel.executed_quantity,
+            )
+        )
+        for order_id, execution_sequence, executed_quantity in result.all():
+            logger.info(
+                "Created order execution: order_id=%s, sequence=%s, executed_quantity=%s",
+                order_id, execution_sequence, executed_quantity,
+            )
+
+    @staticmethod
+    def _stock_amounts(daily_strategy_stock: DailyStrategyStockModel) -> Tuple[float, float, float]:
+        """종목 한 건이 전략 합계에 기여하는 (매수 금액, 매도 금액, 실현 손익)"""
+        buy_price = daily_strategy_stock.buy_price
+        buy_quantity = daily_strategy_stock.buy_quantity
+        sell_price = daily_strategy_stock.sell_price
+        sell_quantity = daily_strategy_stock.sell_quantity
+
+        has_buy = buy_price is not None and buy_quantity is not None
+        has_sell = sell_price is not None and sell_quantity is not None
+
+        buy_amount = buy_price * buy_quantity if has_buy else 0.0
+        sell_amount = sell_price * sell_quantity if has_sell else 0.0
+        profit_amount = (
+            (sell_price - buy_price) * min(sell_quantity, buy_quantity)
+            if has_buy and has_sell else 0.0
+        )
+        return buy_amount, sell_amount, profit_amount
 
     async def _update_daily_strategy_stock(
         self,
@@ -288,36 +711,27 @@ class OrderResultHandler:
         daily_strategy_stock: DailyStrategyStockModel,
         daily_strategy: DailyStrategyModel,
         order: OrderModel,
-        order_type: str
+        order_type: OrderSide
     ) -> None:
         """
         체결 시마다 DailyStrategyStock 및 DailyStrategy 업데이트 (부분 체결 포함)
+
+        DailyStrategy 합계는 전체 종목 재집계 대신 이 종목의 변경분(delta)만 반영
         """
-        if order_type == "BUY":
+        old_buy, old_sell, old_profit = self._stock_amounts(daily_strategy_stock)
+
+        if order_type == OrderSide.BUY:
             daily_strategy_stock.buy_price = order.total_executed_price
             daily_strategy_stock.buy_quantity = float(order.total_executed_quantity)
 
-            logger.info(
-                f"Updated DailyStrategyStock buy info: stock_code={daily_strategy_stock.stock_code}, "
-                f"buy_price={order.total_executed_price:.2f}, "
-                f"buy_quantity={order.total_executed_quantity}, "
-                f"is_fully_executed={order.is_fully_executed}"
-            )
-
-            await session.flush()
-
-            stmt = select(
-                func.sum(DailyStrategyStockModel.buy_price * DailyStrategyStockModel.buy_quantity)
-            ).where(
-                DailyStrategyStockModel.daily_strategy_id == daily_strategy.id,
-                DailyStrategyStockModel.buy_price.isnot(None),
-                DailyStrategyStockModel.buy_quantity.isnot(None)
+            logger.debug(
+                "Updated DailyStrategyStock buy info: stock_code=%s, buy_price=%.2f, "
+                "buy_quantity=%s, is_fully_executed=%s",
+                daily_strategy_stock.stock_code, order.total_executed_price,
+                order.total_executed_quantity, order.is_fully_executed,
             )
-            result = await session.execute(stmt)
-            total_buy_amount = result.scalar() or 0.0
-            daily_strategy.buy_amount = total_buy_amount
 
-        elif order_type == "SELL":
+        elif order_type == OrderSide.SELL:
             daily_strategy_stock.sell_price = order.total_executed_price
             daily_strategy_stock.sell_quantity = float(order.total_executed_quantity)
 
@@ -328,130 +742,202 @@ class OrderResultHandler:
                 actual_quantity = min(order.total_executed_quantity, int(daily_strategy_stock.buy_quantity))
                 profit_amount = (order.total_executed_price - daily_strategy_stock.buy_price) * actual_quantity
 
-                logger.info(
-                    f"Updated DailyStrategyStock sell info: stock_code={daily_strategy_stock.stock_code}, "
-                    f"sell_price={order.total_executed_price:.2f}, "
-                    f"sell_quantity={order.total_executed_quantity}, "
-                    f"profit_rate={profit_rate:.2f}%, "
-                    f"profit_amount={profit_amount:.2f}, "
-                    f"is_fully_executed={order.is_fully_executed}"
+                logger.debug(
+                    "Updated DailyStrategyStock sell info: stock_code=%s, sell_price=%.2f, "
+                    "sell_quantity=%s, profit_rate=%.2f%%, profit_amount=%.2f, "
+                    "is_fully_executed=%s",
+                    daily_strategy_stock.stock_code, order.total_executed_price,
+                    order.total_executed_quantity, profit_rate, profit_amount,
+                    order.is_fully_executed,
                 )
             else:
                 logger.warning(
-                    f"SELL execution but buy_price/buy_quantity not set: "
-                    f"stock_code={daily_strategy_stock.stock_code}"
+                    "SELL execution but buy_price/buy_quantity not set: stock_code=%s",
+                    daily_strategy_stock.stock_code,
                 )
 
-            await session.flush()
-
-            stmt = select(
-                func.sum(DailyStrategyStockModel.sell_price * DailyStrategyStockModel.sell_quantity)
-            ).where(
-                DailyStrategyStockModel.daily_strategy_id == daily_strategy.id,
-                DailyStrategyStockModel.sell_price.isnot(None),
-                DailyStrategyStockModel.sell_quantity.isnot(None)
-            )
-            result = await session.execute(stmt)
-            total_sell_amount = result.scalar() or 0.0
-            daily_strategy.sell_amount = total_sell_amount
-
-            profit_stmt = select(
-                func.sum(
-                    (DailyStrategyStockModel.sell_price - DailyStrategyStockModel.buy_price)
-                    * func.least(DailyStrategyStockModel.sell_quantity, DailyStrategyStockModel.buy_quantity)
-                )
-            ).where(
-                DailyStrategyStockModel.daily_strategy_id == daily_strategy.id,
-                DailyStrategyStockModel.buy_price.isnot(None),
-                DailyStrategyStockModel.buy_quantity.isnot(None),
-                DailyStrategyStockModel.sell_price.isnot(None),
-                DailyStrategyStockModel.sell_quantity.isnot(None)
+        new_buy, new_sell, new_profit = self._stock_amounts(daily_strategy_stock)
+        buy_delta = new_buy - old_buy
+        sell_delta = new_sell - old_sell
+        profit_delta = new_profit - old_profit
+
+        if buy_delta or sell_delta or profit_delta:
+            # 다른 인스턴스가 같은 전략의 다른 종목을 동시에 갱신할 수 있으므로
+            # read-modify-write 대신 SQL에서 원자적으로 더하고 결과는 RETURNING으로 받음
+            # (synchronize_session="fetch"는 SQL 식으로 갱신된 속성을 만료시켜
+            #  이후 접근 시 lazy load → asyncpg에서 MissingGreenlet 발생)
+            result = await session.execute(
+                _APPLY_STRATEGY_DELTA_STMT,
+                {
+                    "ds_id": daily_strategy.id,
+                    "buy_delta": buy_delta,
+                    "sell_delta": sell_delta,
+                    "profit_delta": profit_delta,
+                },
+                execution_options={"synchronize_session": False},
             )
-            profit_result = await session.execute(profit_stmt)
-            daily_strategy.total_profit_amount = profit_result.scalar() or 0.0
-
-            buy_stmt = select(
-                func.sum(DailyStrategyStockModel.buy_price * DailyStrategyStockModel.buy_quantity)
-            ).where(
-                DailyStrategyStockModel.daily_strategy_id == daily_strategy.id,
-                DailyStrategyStockModel.buy_price.isnot(None),
-                DailyStrategyStockModel.buy_quantity.isnot(None)
-            )
-            buy_result = await session.execute(buy_stmt)
-            total_buy_amount = buy_result.scalar() or 0.0
-
+            total_buy_amount, total_sell_amount, total_profit_amount = result.one()
+            # 세션 객체에는 DB 값을 변경 없음(clean) 상태로 반영 (flush 시 덮어쓰지 않음)
+            set_committed_value(daily_strategy, "buy_amount", total_buy_amount)
+            set_committed_value(daily_strategy, "sell_amount", total_sell_amount)
+            set_committed_value(daily_strategy, "total_profit_amount", total_profit_amount)
+        else:
+            total_buy_amount = daily_strategy.buy_amount
+            total_profit_amount = daily_strategy.total_profit_amount
+
+        if order_type == OrderSide.SELL:
+            total_buy_amount = total_buy_amount or 0.0
             if total_buy_amount > 0:
-                daily_strategy.total_profit_rate = (daily_strategy.total_profit_amount / total_buy_amount) * 100
+                daily_strategy.total_profit_rate = ((total_profit_amount or 0.0) / total_buy_amount) * 100
 
     async def _update_account_balance_on_execution(
         self,
         session: AsyncSession,
         daily_strategy: DailyStrategyModel,
         order: OrderModel,
-        order_type: str,
+        order_type: OrderSide,
         executed_quantity: int,
         executed_price: float,
     ) -> None:
         """
-        체결 시마다 Account balance 반영 (이번 체결분 delta만).
+        체결 시마다 Account balance 반영.
+
+        MOCK은 이번 체결분 delta만 반영하고, PAPER/REAL은 커밋 후 KIS 예수금 조회를 예약
         """
         account = daily_strategy.user_strategy.account
-        delta_amount = float(executed_price * executed_quantity)
-
-        if account.account_type == AccountType.MOCK:
-            balance = float(account.account_balance) if account.account_balance is not None else 0.0
-            if order_type == "BUY":
-                account.account_balance = balance - delta_amount
-            else:
-                account.account_balance = balance + delta_amount
+        account_type = account.account_type
+
+        if account_type == AccountType.MOCK:
+            # executed_price(float) * executed_quantity(int)는 이미 float
+            delta_amount = executed_price * executed_quantity
+            if order_type == OrderSide.BUY:
+                delta_amount = -delta_amount
+            # 같은 계좌의 다른 체결이 동시에 반영될 수 있으므로 SQL에서 원자적으로 가감
+            # (만료된 account_balance 속성 대신 RETURNING 값을 사용)
+            result = await session.execute(
+                _APPLY_MOCK_BALANCE_DELTA_STMT,
+                {"account_id": account.id, "balance_delta": delta_amount},
+                execution_options={"synchronize_session": False},
+            )
+            account_balance = result.scalar_one()
+            set_committed_value(account, "account_balance", account_balance)
             logger.info(
-                f"Updated MOCK account balance: account_id={account.id}, "
-                f"order_type={order_type}, delta={-delta_amount if order_type == 'BUY' else delta_amount:+.0f}, "
-                f"balance={account.account_balance}"
+                "Updated MOCK account balance: account_id=%s, order_type=%s, "
+                "delta=%+.0f, balance=%s",
+                account.id, order_type, delta_amount, account_balance,
             )
-        elif account.account_type in (AccountType.PAPER, AccountType.REAL):
-            is_paper = account.account_type == AccountType.PAPER
+        elif account_type in (AccountType.PAPER, AccountType.REAL):
+            # KIS 예수금 조회는 트랜잭션/advisory lock 밖에서 커밋 후 별도 태스크로 수행
+            self._balance_refresh_accounts.add(account.id)
+
+    def _schedule_balance_refreshes(self) -> None:
+        """커밋 후 대기 중인 계좌의 KIS 예수금 갱신 태스크 실행 (계좌별 1개만 진행)"""
+        # 호출 시점은 체결 커밋 이후 → 이 시각 이후 시작된 조회에는 체결이 반영됨
+        requested_at = time.monotonic()
+        while self._balance_refresh_accounts:
+            account_id = self._balance_refresh_accounts.pop()
+            if account_id in self._balance_refresh_tasks:
+                # 이미 갱신 중인 계좌는 진행 중 태스크 종료 시 다시 갱신
+                self._balance_refresh_pending[account_id] = requested_at
+            else:
+                self._start_balance_refresh(account_id, requested_at)
+
+    def _start_balance_refresh(self, account_id: int, requested_at: float) -> None:
+        """계좌 예수금 갱신 태스크 생성 (종료 시 대기 중인 갱신 요청이 있으면 재실행)"""
+        task = asyncio.create_task(self._refresh_account_balance(account_id, requested_at))
+        self._balance_refresh_tasks[account_id] = task
+        task.add_done_callback(
+            lambda _, account_id=account_id: self._on_balance_refresh_done(account_id)
+        )
 
-            rate_limiter = get_account_rate_limiter(account.id, is_paper)
-            await rate_limiter._wait_if_needed_async()
+    def _on_balance_refresh_done(self, account_id: int) -> None:
+        """갱신 태스크 종료 콜백: 진행 중에 커밋된 체결이 있으면 바로 다시 갱신"""
+        self._balance_refresh_tasks.pop(account_id, None)
+        requested_at = self._balance_refresh_pending.pop(account_id, None)
+        if requested_at is not None:
+            self._start_balance_refresh(account_id, requested_at)
 
-            kis = KISService(account.app_key, account.app_secret, is_paper=is_paper)
-            if account.is_token_valid() and account.kis_access_token:
-                kis.access_token = account.kis_access_token
-            else:
-                await kis.get_access_token()
-                account.kis_access_token = kis.access_token
-                account.kis_token_expired_at = kis.token_expired_at
-            try:
-                balance_data = await kis.get_account_balance(account.account_number)
-                if balance_data.get("rt_cd") == "0" and balance_data.get("output2"):
-                    cash_balance = int(
-                        balance_data["output2"][0].get("dnca_tot_amt", 0)
-                    )
-                    account.account_balance = cash_balance
-                    logger.info(
-                        f"Updated PAPER/REAL account balance from KIS (예수금): "
-                        f"account_id={account.id}, balance={cash_balance}"
-                    )
-                else:
-                    logger.warning(
-                        f"KIS balance inquiry failed or empty output2: "
-                        f"account_id={account.id}, "
-                        f"rt_cd={balance_data.get('rt_cd', 'N/A')}"
-                    )
-            except Exception as e:
-                logger.warning(
-                    f"KIS balance inquiry error, skip balance update: "
-                    f"account_id={account.id}, error={e}"
-                )
+    async def _refresh_account_balance(self, account_id: int, requested_at: float) -> None:
+        """
+        PAPER/REAL 계좌 예수금을 KIS에서 조회해 저장 (백그라운드 태스크, 예외는 로깅만)
+
+        KIS 예수금(절대값)으로 덮어쓰므로 체결 처리와 순서가 어긋나도 무방
+
+        Args:
+            account_id: 계좌 id
+            requested_at: 갱신 요청 시각 (time.monotonic, 체결 커밋 이후)
+        """
+        # 짧게 대기 후 조회: 대기 중 커밋된 같은 계좌의 체결도 이번 조회 결과에 포함되고,
+        # 그 사이 예약 요청은 진행 중 태스크 종료 후 재실행으로 합쳐짐
+        await asyncio.sleep(ACCOUNT_BALANCE_REFRESH_DEBOUNCE)
+
+        # 요청 이후에 시작된 조회 결과가 있으면 KIS 호출(rate limit 대기 포함) 생략
+        # (요청 이전 조회는 체결이 반영되지 않았을 수 있으므로 재조회)
+        cached = self._balance_cache.get(account_id)
+        if cached and cached[0] >= requested_at:
+            logger.debug(
+                "Skipping PAPER/REAL balance refresh (cached): account_id=%s, balance=%s",
+                account_id, cached[1],
+            )
+            return
+
+        try:
+            async with self._session_factory() as session:
+                account = await AccountRepository(session).get_by_id(account_id)
+                if account is None:
+                    return
+                is_paper = account.account_type == AccountType.PAPER
+
+                # KIS 호출 전 계좌별 rate limit 슬롯 확보
+                async with get_account_rate_limiter(account.id, is_paper):
+                    kis = await self._get_kis_service(account, is_paper)
+                    # 프로세스 캐시 → DB 저장 토큰 → 재발급 순으로 사용 (재발급 시에만 DB 기록)
+                    cached_token = self._get_cached_token(account.id)
+                    if cached_token:
+                        kis.access_token = cached_token
+                    elif account.is_token_valid() and account.kis_access_token:
+                        kis.access_token = account.kis_access_token
+                        self._set_cached_token(
+                            account.id, account.kis_access_token, account.kis_token_expired_at
+                        )
+                    else:
+                        await kis.get_access_token()
+                        account.kis_access_token = kis.access_token
+                        account.kis_token_expired_at = kis.token_expired_at
+                        self._set_cached_token(account.id, kis.access_token, kis.token_expired_at)
+
+                    fetched_at = time.monotonic()
+                    balance_data = await kis.get_account_balance(account.account_number)
+                    rt_cd = balance_data.get("rt_cd")
+                    output2 = balance_data.get("output2")
+                    if rt_cd == "0" and output2:
+                        cash_balance = int(output2[0].get("dnca_tot_amt", 0) or 0)
+                        account.account_balance = cash_balance
+                        self._balance_cache[account.id] = (fetched_at, cash_balance)
+                        logger.info(
+                            "Updated PAPER/REAL account balance from KIS (예수금): "
+                            "account_id=%s, balance=%s",
+                            account.id, cash_balance,
+                        )
+                    else:
+                        logger.warning(
+                            "KIS balance inquiry failed or empty output2: account_id=%s, rt_cd=%s",
+                            account.id, rt_cd or 'N/A',
+                        )
+
+                # 토큰 갱신분 포함 저장
+                await session.commit()
+        except Exception as e:
+            logger.warning(
+                "KIS balance inquiry error, skip balance update: account_id=%s, error=%s",
+                account_id, e,
+            )
 
 
-_handler_instance: Optional[OrderResultHandler] = None
+# 싱글톤 인스턴스 (모듈 import 시 1회 생성)
+_handler_instance = OrderResultHandler()
 
 
 def get_order_result_handler() -> OrderResultHandler:
     """Order Result Handler 싱글톤 인스턴스 반환"""
-    global _handler_instance
-    if _handler_instance is None:
-        _handler_instance = OrderResultHandler()
     return _handler_instance
@@ -1,11 +1,10 @@
 import logging
-from typing import Optional
 from datetime import date
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.db_connections import get_session_factory
-from app.schemas.order_signal import OrderSignalMessage
+from app.schemas.order_signal import OrderSignalMessage, OrderSide
 from app.repositories.stock_repository import StockRepository
 from app.repositories.account_repository import AccountRepository
 from app.database.database.strategy import (
@@ -20,105 +19,97 @@ class OrderSignalHandler:
 
     def __init__(self):
         self._session_factory = get_session_factory()
+        # 시그널 타입별 처리 함수
+        self._signal_handlers = {
+            OrderSide.SELL: self._update_sell_info,
+            OrderSide.BUY: self._update_buy_info,
+        }
 
     async def handle_order_signal(self, message: OrderSignalMessage) -> None:
         """
         주문 시그널 메시지 처리 및 데이터베이스 저장
         """
         logger.info(
-            f"Processing order signal message: {message.user_strategy_id} at {message.timestamp}"
+            "Processing order signal message: %s at %s",
+            message.user_strategy_id, message.timestamp,
         )
 
-        session: Optional[AsyncSession] = None
         try:
-            session = self._session_factory()
-
-            # 주문 시그널 메시지 처리
-            timestamp = message.timestamp
-            user_strategy_id = message.user_strategy_id
-            signal_type = message.signal_type
-            stock_code = message.stock_code
-            current_price = message.current_price
-            target_price = message.target_price
-            target_quantity = message.target_quantity
-            stop_loss_price = message.stop_loss_price
-            recommended_order_price = message.recommended_order_price
-            
-            order_date = timestamp.date()
-
-            # DailyStrategy 조회 (stocks 관계 포함) - 레포지토리 사용
-            stock_repository = StockRepository(session)
-            daily_strategy = await stock_repository.get_daily_strategy_with_stocks(
-                user_strategy_id, order_date
-            )
-
-            if not daily_strategy:
-                logger.warning(
-                    f"DailyStrategy not found: user_strategy_id={user_strategy_id}, date={order_date}"
+            # 세션 컨텍스트: 종료 시 close (예외 시 미커밋 트랜잭션 롤백 후 커넥션 반환)
+            async with self._session_factory() as session:
+                # 주문 시그널 메시지 처리
+                timestamp = message.timestamp
+                user_strategy_id = message.user_strategy_id
+                signal_type = message.signal_type
+                stock_code = message.stock_code
+                current_price = message.current_price
+                target_price = message.target_price
+                target_quantity = message.target_quantity
+                stop_loss_price = message.stop_loss_price
+                recommended_order_price = message.recommended_order_price
+
+                order_date = timestamp.date()
+
+                # DailyStrategy + 해당 종목 조회 (종목 컬렉션 전체 로드 없이 한 번에)
+                stock_repository = StockRepository(session)
+                daily_strategy, stock = await stock_repository.get_daily_strategy_with_stock(
+                    user_strategy_id, order_date, stock_code
                 )
-                return
 
-            # UserStrategy 조회 (user 정보 포함)
-            user_strategy = await stock_repository.get_user_strategy_with_info(user_strategy_id)
-            if not user_strategy:
-                logger.warning(
-                    f"UserStrategy not found: user_strategy_id={user_strategy_id}"
-                )
-                return
-
-            # 해당 종목 찾기
-            stock = None
-            for s in daily_strategy.stocks:
-                if s.stock_code == stock_code:
-                    stock = s
-                    break
-
-            if not stock:
-                logger.warning(
-                    f"DailyStrategyStock not found: stock_code={stock_code}, daily_strategy_id={daily_strategy.id}"
-                )
-                return
-
-            # 계좌 조회 및 잔액 업데이트
-            account_repository = AccountRepository(session)
-            user_accounts = await account_repository.get_by_user_uid(user_strategy.user_id)
-            
-            if not user_accounts:
-                logger.warning(
-                    f"User accounts not found: user_id={user_strategy.user_id}"
-                )
-                return
-            
-            # 첫 번째 계좌 사용 (또는 기본 계좌 선택 로직 필요)
-            account = user_accounts[0]
-            
-            # 주문 금액 계산
-            order_amount = recommended_order_price * target_quantity
-
-            if signal_type == "SELL":
-                await self._update_sell_info(
-                    session, daily_strategy, stock, stock_code,
-                    recommended_order_price, target_quantity,
-                    account_repository, account, order_amount
-                )
-            elif signal_type == "BUY":
-                await self._update_buy_info(
-                    session, daily_strategy, stock, stock_code,
-                    recommended_order_price, target_quantity,
-                    account_repository, account, order_amount
+                if not daily_strategy:
+                    logger.warning(
+                        "DailyStrategy not found: user_strategy_id=%s, date=%s",
+                        user_strategy_id, order_date,
+                    )
+                    return
+
+                # UserStrategy 조회 (user 정보 포함)
+                user_strategy = await stock_repository.get_user_strategy_with_info(user_strategy_id)
+                if not user_strategy:
+                    logger.warning(
+                        "UserStrategy not found: user_strategy_id=%s", user_strategy_id
+                    )
+                    return
+
+                if not stock:
+                    logger.warning(
+                        "DailyStrategyStock not found: stock_code=%s, daily_strategy_id=%s",
+                        stock_code, daily_strategy.id,
+                    )
+                    return
+
+                # 계좌 조회 및 잔액 업데이트
+                account_repository = AccountRepository(session)
+                user_accounts = await account_repository.get_by_user_uid(user_strategy.user_id)
+
+                if not user_accounts:
+                    logger.warning(
+                        "User accounts not found: user_id=%s", user_strategy.user_id
+                    )
+                    return
+
+                # 첫 번째 계좌 사용 (또는 기본 계좌 선택 로직 필요)
+                account = user_accounts[0]
+
+                # 주문 금액 계산
+                order_amount = recommended_order_price * target_quantity
+
+                signal_handler = self._signal_handlers.get(signal_type)
+                if signal_handler:
+                    await signal_handler(
+                        session, daily_strategy, stock, stock_code,
+                        recommended_order_price, target_quantity,
+                        stock_repository, account_repository, account, order_amount
+                    )
+
+                await session.commit()
+                logger.info(
+                    "Successfully processed %s signal for stock_code=%s", signal_type, stock_code
                 )
 
-            await session.commit()
-            logger.info(f"Successfully processed {signal_type} signal for stock_code={stock_code}")
-
         except Exception as e:
-            logger.error(f"Error processing order signal: {e}", exc_info=True)
-            if session:
-                await session.rollback()
+            logger.error("Error processing order signal: %s", e, exc_info=True)
             raise
-        finally:
-            if session:
-                await session.close()
 
     async def _update_sell_info(
         self,
@@ -128,6 +119,7 @@ class OrderSignalHandler:
         stock_code: str,
         recommended_order_price: float,
         target_quantity: int,
+        stock_repository: StockRepository,
         account_repository: AccountRepository,
         account,
         order_amount: float
@@ -140,8 +132,8 @@ class OrderSignalHandler:
         # 계좌 잔액 증가 (매도 금액 입금)
         await account_repository.update_balance(account, order_amount)
         logger.info(
-            f"Account balance updated: +{order_amount:.2f}, "
-            f"new balance={account.account_balance:.2f}"
+            "Account balance updated: +%.2f, new balance=%.2f",
+            order_amount, account.account_balance,
         )
 
         # 수익률 계산 (매수가가 있는 경우에만)
@@ -163,10 +155,8 @@ class OrderSignalHandler:
             daily_strategy.total_profit_amount += profit_amount
 
             # DailyStrategy의 총 수익률 계산 (가중 평균)
-            total_buy_amount = sum(
-                s.buy_price * s.buy_quantity 
-                for s in daily_strategy.stocks 
-                if s.buy_price and s.buy_quantity
+            total_buy_amount = await stock_repository.get_total_buy_amount(
+                daily_strategy.id
             )
             if total_buy_amount > 0:
                 daily_strategy.total_profit_rate = (
@@ -174,12 +164,13 @@ class OrderSignalHandler:
                 ) * 100
 
             logger.info(
-                f"SELL signal processed: stock_code={stock_code}, "
-                f"profit_rate={profit_rate:.2f}%, profit_amount={profit_amount:.2f}"
+                "SELL signal processed: stock_code=%s, profit_rate=%.2f%%, profit_amount=%.2f",
+                stock_code, profit_rate, profit_amount,
             )
         else:
             logger.warning(
-                f"SELL signal processed but buy_price/buy_quantity not set: stock_code={stock_code}"
+                "SELL signal processed but buy_price/buy_quantity not set: stock_code=%s",
+                stock_code,
             )
             # 매수가 정보가 없어도 매도 정보는 저장
             if daily_strategy.sell_amount is None:
@@ -194,6 +185,7 @@ class OrderSignalHandler:
         stock_code: str,
         recommended_order_price: float,
         target_quantity: int,
+        stock_repository: StockRepository,
         account_repository: AccountRepository,
         account,
         order_amount: float
@@ -206,8 +198,8 @@ class OrderSignalHandler:
         # 계좌 잔액 감소 (매수 금액 출금)
         await account_repository.update_balance(account, -order_amount)
         logger.info(
-            f"Account balance updated: -{order_amount:.2f}, "
-            f"new balance={account.account_balance:.2f}"
+            "Account balance updated: -%.2f, new balance=%.2f",
+            order_amount, account.account_balance,
         )
 
         # DailyStrategy의 총 매수금액 업데이트
@@ -216,14 +208,15 @@ class OrderSignalHandler:
         daily_strategy.buy_amount += order_amount
 
         logger.info(
-            f"BUY signal processed: stock_code={stock_code}, "
-            f"buy_price={recommended_order_price:.2f}, quantity={target_quantity}"
+            "BUY signal processed: stock_code=%s, buy_price=%.2f, quantity=%s",
+            stock_code, recommended_order_price, target_quantity,
         )
 
-_handler_instance: Optional[OrderSignalHandler] = None
+
+# 싱글톤 인스턴스 (모듈 import 시 1회 생성)
+_handler_instance = OrderSignalHandler()
+
+
 def get_order_signal_handler() -> OrderSignalHandler:
     """Order Signal Handler 싱글톤 인스턴스 반환"""
-    global _handler_instance
-    if _handler_instance is None:
-        _handler_instance = OrderSignalHandler()
-    return _handler_instance
\ No newline at end of file
+    return _handler_instance
@@ -7,139 +7,24 @@ Kafka에서 받은 가격 데이터를 메모리 캐시에 저장
 
 import asyncio
 import logging
-from datetime import date, datetime, time
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-from sqlalchemy.dialects.postgresql import insert
-
 from app.schemas.price import PriceMessage
-from app.services.price_cache import get_price_cache
+from app.services.price_cache import Tick, get_price_cache
 from app.config.db_connections import get_session_factory
+from app.repositories.candle_repository import CandleRepository
+from app.utils.candle_aggregator import aggregate_stock_ticks
+from app.utils.error_log_sampler import ErrorLogSampler
 from app.database.database.strategy import HourCandleData, MinuteCandleData
 
 logger = logging.getLogger(__name__)
 
 KST = ZoneInfo("Asia/Seoul")
 
-
-class HourCandleAggregator:
-    """틱 데이터를 1시간봉으로 집계"""
-
-    def __init__(self):
-        self.open: Optional[float] = None
-        self.high: Optional[float] = None
-        self.low: Optional[float] = None
-        self.close: Optional[float] = None
-        self.volume: int = 0
-        self.trade_count: int = 0
-
-    def add_tick(self, price: float, volume: int) -> None:
-        """틱 데이터 추가"""
-        if self.open is None:
-            self.open = price
-
-        if self.high is None or price > self.high:
-            self.high = price
-
-        if self.low is None or price < self.low:
-            self.low = price
-
-        self.close = price
-        self.volume += volume
-        self.trade_count += 1
-
-    def to_dict(self, stock_code: str, candle_date: date, hour: int) -> dict:
-        """딕셔너리로 변환"""
-        return {
-            "stock_code": stock_code,
-            "candle_date": candle_date,
-            "hour": hour,
-            "open": self.open or 0,
-            "high": self.high or 0,
-            "low": self.low or 0,
-            "close": self.close or 0,
-            "volume": self.volume,
-            "trade_count": self.trade_count,
-        }
-
-
-def aggregate_ticks_to_candle(
-    stock_code: str,
-    ticks: List[PriceMessage],
-    candle_date: date,
-    hour: int
-) -> Optional[dict]:
-    """틱 데이터를 단일 시간봉으로 집계"""
-    if not ticks:
-        return None
-
-    aggregator = HourCandleAggregator()
-
-    for tick in ticks:
-        try:
-            price = float(tick.current_price)
-            volume = int(tick.trade_volume)
-            aggregator.add_tick(price, volume)
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Invalid tick data: {e}")
-            continue
-
-    if aggregator.trade_count == 0:
-        return None
-
-    return aggregator.to_dict(stock_code, candle_date, hour)
-
-
-def aggregate_ticks_to_minute_candles(
-    stock_code: str,
-    ticks: List[PriceMessage],
-    candle_date: date,
-    minute_interval: int = 1
-) -> List[dict]:
-    """틱 데이터를 분봉으로 집계"""
-    if not ticks:
-        return []
-
-    # minute_interval에 맞게 그룹핑 (trade_time: HHMMSS)
-    # 예: 10분봉이면 0901~0910 → 0900, 0911~0920 → 0910
-    minute_groups: Dict[int, List[PriceMessage]] = {}
-    for tick in ticks:
-        hh = int(tick.trade_time[:2])
-        mm = int(tick.trade_time[2:4])
-        aligned_mm = (mm // minute_interval) * minute_interval
-        minute_key = hh * 100 + aligned_mm
-        if minute_key not in minute_groups:
-            minute_groups[minute_key] = []
-        minute_groups[minute_key].append(tick)
-
-    candles = []
-    for minute_key, minute_ticks in sorted(minute_groups.items()):
-        aggregator = HourCandleAggregator()  # 같은 로직 재사용
-        for tick in minute_ticks:
-            try:
-                price = float(tick.current_price)
-                volume = int(tick.trade_volume)
-                aggregator.add_tick(price, volume)
-            except (ValueError, TypeError):
-                continue
-
-        if aggregator.trade_count > 0:
-            hh, mm = divmod(minute_key, 100)
-            candles.append({
-                "stock_code": stock_code,
-                "candle_date": candle_date,
-                "candle_time": time(hh, mm, 0),
-                "minute_interval": minute_interval,
-                "open": aggregator.open or 0,
-                "high": aggregator.high or 0,
-                "low": aggregator.low or 0,
-                "close": aggregator.close or 0,
-                "volume": aggregator.volume,
-                "trade_count": aggregator.trade_count,
-            })
-
-    return candles
+# 시간 변경 시 DB 저장 대기 큐 크기 (가득 차면 put 대기 → 동시 DB 쓰기 제한)
+FLUSH_QUEUE_MAXSIZE = 4
 
 
 class PriceHandler:
@@ -148,6 +33,13 @@ class PriceHandler:
     def __init__(self):
         self._price_cache = get_price_cache()
         self._session_factory = get_session_factory()
+        # 틱마다 반복되는 에러는 traceback 샘플링
+        self._error_log = ErrorLogSampler(logger)
+        # 직전 시간 데이터 저장 큐 (단일 writer 태스크가 순서대로 처리)
+        self._flush_queue: asyncio.Queue[Tuple[int, Dict[str, List[Tick]]]] = asyncio.Queue(
+            maxsize=FLUSH_QUEUE_MAXSIZE
+        )
+        self._flush_worker_task: Optional[asyncio.Task] = None
 
     async def handle_price(self, price_msg: PriceMessage) -> None:
         """
@@ -166,23 +58,44 @@ class PriceHandler:
             if hour_changed and prev_hour is not None and prev_hour_data:
                 # 장 시간 필터 (08:00 ~ 20:00) - NXT 프리마켓(08:00~) + 야간장(~20:00) 포함
                 if 8 <= prev_hour <= 20:
-                    asyncio.create_task(
-                        self._save_hour_candles(prev_hour, prev_hour_data)
-                    )
-                    asyncio.create_task(
-                        self._save_minute_candles(prev_hour_data)
-                    )
+                    if self._flush_worker_task is None or self._flush_worker_task.done():
+                        self._flush_worker_task = asyncio.create_task(self._flush_worker())
+                    await self._flush_queue.put((prev_hour, prev_hour_data))
 
         except Exception as e:
-            logger.error(f"Error handling price message: {e}", exc_info=True)
+            self._error_log.error("handle_price", "Error handling price message: %s", e)
+
+    async def close(self) -> None:
+        """큐에 남은 캔들 저장 완료 대기 후 writer 종료 (앱 종료 시 호출)"""
+        if self._flush_worker_task is None:
+            return
+
+        await self._flush_queue.join()
+        self._flush_worker_task.cancel()
+        try:
+            await self._flush_worker_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_worker_task = None
+
+    async def _flush_worker(self) -> None:
+        """큐에서 직전 시간 데이터를 꺼내 하나씩 DB에 저장"""
+        while True:
+            hour, hour_data = await self._flush_queue.get()
+            try:
+                await self._flush_previous_hour(hour, hour_data)
+            finally:
+                self._flush_queue.task_done()
 
-    async def _save_hour_candles(
+    async def _flush_previous_hour(
         self,
         hour: int,
-        hour_data: Dict[str, List[PriceMessage]]
+        hour_data: Dict[str, List[Tick]]
     ) -> None:
         """
-        시간봉 데이터를 DB에 저장
+        직전 시간 데이터를 시간봉/분봉으로 DB에 저장
+
+        두 upsert를 한 세션/트랜잭션에서 실행하고 커밋은 한 번
 
         Args:
             hour: 시간 (9, 10, 11, ...)
@@ -199,115 +112,62 @@ class PriceHandler:
                 f"total_ticks={sum(len(t) for t in hour_data.values())}"
             )
 
-            # 종목별로 시간봉 생성
+            # 종목별로 시간봉/분봉 생성
             candles = []
+            minute_candles = []
             for stock_code, ticks in hour_data.items():
-                candle = aggregate_ticks_to_candle(stock_code, ticks, cache_date, hour)
+                candle, stock_minute_candles = aggregate_stock_ticks(
+                    stock_code, ticks, cache_date, hour
+                )
                 if candle:
                     candles.append(candle)
+                minute_candles.extend(stock_minute_candles)
 
-            if not candles:
+            if not candles and not minute_candles:
                 logger.info(f"No candles generated for hour {hour}")
                 return
 
             # DB에 저장
-            await self._save_candles_to_db(candles)
-            logger.info(f"Successfully saved {len(candles)} hour candles for hour {hour}")
+            await self._save_candles_to_db(candles, minute_candles)
+            logger.info(
+                f"Successfully saved {len(candles)} hour candles, "
+                f"{len(minute_candles)} minute candles for hour {hour}"
+            )
 
         except Exception as e:
-            logger.error(f"Error saving hour candles: {e}", exc_info=True)
-
-    async def _save_candles_to_db(self, candles: List[dict]) -> None:
-        """시간봉 데이터를 DB에 저장 (upsert)"""
-        if HourCandleData is None:
-            logger.error("HourCandleData model not available")
-            return
-
-        async with self._session_factory() as session:
-            try:
-                stmt = insert(HourCandleData).values(candles)
-                stmt = stmt.on_conflict_do_update(
-                    constraint='uq_hour_candle_stock_date_hour',
-                    set_={
-                        'open': stmt.excluded.open,
-                        'high': stmt.excluded.high,
-                        'low': stmt.excluded.low,
-                        'close': stmt.excluded.close,
-                        'volume': stmt.excluded.volume,
-                        'trade_count': stmt.excluded.trade_count,
-                    }
-                )
-
-                await session.execute(stmt)
-                await session.commit()
-
-            except Exception as e:
-                await session.rollback()
-                logger.error(f"Error saving candles to database: {e}", exc_info=True)
-                raise
+            logger.error(f"Error saving candles for hour {hour}: {e}", exc_info=True)
 
-    async def _save_minute_candles(
+    async def _save_candles_to_db(
         self,
-        hour_data: Dict[str, List[PriceMessage]]
+        candles: List[dict],
+        minute_candles: List[tuple],
     ) -> None:
-        """분봉 데이터를 DB에 저장"""
-        try:
-            cache_date = self._price_cache.get_cache_date()
-            if cache_date is None:
-                cache_date = datetime.now(KST).date()
-
-            all_candles = []
-            for stock_code, ticks in hour_data.items():
-                candles = aggregate_ticks_to_minute_candles(stock_code, ticks, cache_date)
-                all_candles.extend(candles)
-
-            if not all_candles:
-                logger.info("No minute candles generated")
-                return
-
-            await self._save_minute_candles_to_db(all_candles)
-            logger.info(f"Successfully saved {len(all_candles)} minute candles")
-
-        except Exception as e:
-            logger.error(f"Error saving minute candles: {e}", exc_info=True)
+        """
+        시간봉/분봉 데이터를 DB에 저장 (upsert)
 
-    async def _save_minute_candles_to_db(self, candles: List[dict]) -> None:
-        """분봉 데이터를 DB에 저장 (upsert)"""
-        if MinuteCandleData is None:
-            logger.error("MinuteCandleData model not available")
+        COPY로 임시 테이블에 적재한 뒤 INSERT ... SELECT ... ON CONFLICT 한 번으로 반영
+        """
+        if HourCandleData is None or MinuteCandleData is None:
+            logger.error("HourCandleData/MinuteCandleData model not available")
             return
 
         async with self._session_factory() as session:
             try:
-                stmt = insert(MinuteCandleData).values(candles)
-                stmt = stmt.on_conflict_do_update(
-                    constraint='uq_minute_candle_stock_date_time_interval',
-                    set_={
-                        'open': stmt.excluded.open,
-                        'high': stmt.excluded.high,
-                        'low': stmt.excluded.low,
-                        'close': stmt.excluded.close,
-                        'volume': stmt.excluded.volume,
-                        'trade_count': stmt.excluded.trade_count,
-                    }
-                )
-
-                await session.execute(stmt)
+                candle_repository = CandleRepository(session)
+                await candle_repository.upsert_hour_candles(candles)
+                await candle_repository.upsert_minute_candle_records(minute_candles)
                 await session.commit()
 
             except Exception as e:
                 await session.rollback()
-                logger.error(f"Error saving minute candles to database: {e}", exc_info=True)
+                logger.error(f"Error saving candles to database: {e}", exc_info=True)
                 raise
 
 
-# 싱글톤 인스턴스
-_price_handler_instance = None
+# 싱글톤 인스턴스 (모듈 import 시 1회 생성)
+_price_handler_instance = PriceHandler()
 
 
 def get_price_handler() -> PriceHandler:
     """Price Handler 싱글톤 인스턴스 반환"""
-    global _price_handler_instance
-    if _price_handler_instance is None:
-        _price_handler_instance = PriceHandler()
     return _price_handler_instance
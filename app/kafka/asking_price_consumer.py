@@ -5,12 +5,12 @@ Kafka Consumer for Real-time Asking Price Data
 """
 
 import asyncio
-import json
 import logging
 from typing import Callable, Optional, List
 
 from aiokafka import AIOKafkaConsumer
 from aiokafka.errors import KafkaConnectionError
+from pydantic import ValidationError
 
 from app.config.kafka_connections import get_kafka_config
 from app.schemas.asking_price import AskingPriceMessage
@@ -41,7 +41,6 @@ class KafkaAskingPriceConsumer:
                 group_id=f"{self._config.kafka_group_id}-asking-price",
                 auto_offset_reset=self._config.kafka_auto_offset_reset,
                 enable_auto_commit=self._config.kafka_enable_auto_commit,
-                value_deserializer=lambda m: m.decode('utf-8'),
             )
 
             await self._consumer.start()
@@ -81,9 +80,8 @@ class KafkaAskingPriceConsumer:
                     break
 
                 try:
-                    # JSON 파싱
-                    data = json.loads(msg.value)
-                    asking_price_msg = AskingPriceMessage(**data)
+                    # JSON 파싱 + 검증 (raw bytes -> 모델, 중간 dict 생성 없음)
+                    asking_price_msg = AskingPriceMessage.model_validate_json(msg.value)
 
                     # 등록된 핸들러들 호출
                     for handler in self._handlers:
@@ -95,8 +93,8 @@ class KafkaAskingPriceConsumer:
                         except Exception as e:
                             logger.error(f"Asking price handler error: {e}", exc_info=True)
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
+                except ValidationError as e:
+                    logger.error(f"Message validation error: {e}")
                 except Exception as e:
                     logger.error(f"Asking price message processing error: {e}", exc_info=True)
 
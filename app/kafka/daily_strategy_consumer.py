@@ -3,12 +3,12 @@ Kafka Consumer for Daily Strategy Messages
 """
 
 import asyncio
-import json
 import logging
 from typing import Callable, Optional, List
 
 from aiokafka import AIOKafkaConsumer
 from aiokafka.errors import KafkaConnectionError
+from pydantic import ValidationError
 
 from app.config.kafka_connections import get_kafka_config
 from app.schemas.daily_strategy import DailyStrategyMessage
@@ -39,7 +39,6 @@ class KafkaDailyStrategyConsumer:
                 group_id=f"{self._config.kafka_group_id}-daily-strategy",
                 auto_offset_reset=self._config.kafka_auto_offset_reset,
                 enable_auto_commit=self._config.kafka_enable_auto_commit,
-                value_deserializer=lambda m: m.decode('utf-8'),
             )
 
             await self._consumer.start()
@@ -79,9 +78,8 @@ class KafkaDailyStrategyConsumer:
                     break
 
                 try:
-                    # JSON 파싱
-                    data = json.loads(msg.value)
-                    daily_strategy_msg = DailyStrategyMessage(**data)
+                    # JSON 파싱 + 검증 (raw bytes -> 모델, 중간 dict 생성 없음)
+                    daily_strategy_msg = DailyStrategyMessage.model_validate_json(msg.value)
 
                     total_users = len(daily_strategy_msg.strategies_by_user)
                     total_strategies = sum(
@@ -104,8 +102,8 @@ class KafkaDailyStrategyConsumer:
                         except Exception as e:
                             logger.error(f"Handler error: {e}", exc_info=True)
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
+                except ValidationError as e:
+                    logger.error(f"Message validation error: {e}")
                 except Exception as e:
                     logger.error(f"Message processing error: {e}", exc_info=True)
 
@@ -11,6 +11,11 @@ from app.schemas.order_signal import OrderSignalMessage, OrderResultMessage
 
 logger = logging.getLogger(__name__)
 
+# 한 번에 가져오는 최대 메시지 수 - 주문 결과는 이 단위로 한 트랜잭션에 커밋 (커밋/fsync 횟수 감소)
+FETCH_MAX_RECORDS = 50
+# 수신 대기 시간 - 대기 중인 메시지가 없을 때 getmany 1회 최대 대기
+FETCH_TIMEOUT_MS = 50
+
 class KafkaOrderSignalConsumer:
     """주문 시그널 및 주문 결과 메시지를 Kafka에서 수신하는 Consumer"""
     
@@ -19,15 +24,15 @@ class KafkaOrderSignalConsumer:
         self._consumer: Optional[AIOKafkaConsumer] = None
         self._running = False
         self._handlers: List[Callable[[OrderSignalMessage], None]] = []
-        self._order_result_handlers: List[Callable[[OrderResultMessage], None]] = []
+        self._order_result_handlers: List[Callable[[List[OrderResultMessage]], None]] = []
 
     def add_handler(self, handler: Callable[[OrderSignalMessage], None]) -> None:
         """주문 시그널 메시지 핸들러 등록"""
         self._handlers.append(handler)
         logger.info(f"Order signal handler registered: {handler.__name__}")
 
-    def add_order_result_handler(self, handler: Callable[[OrderResultMessage], None]) -> None:
-        """주문 결과 메시지 핸들러 등록"""
+    def add_order_result_handler(self, handler: Callable[[List[OrderResultMessage]], None]) -> None:
+        """주문 결과 메시지 핸들러 등록 (한 번에 수신한 주문 결과 목록 단위로 호출)"""
         self._order_result_handlers.append(handler)
         logger.info(f"Order result handler registered: {handler.__name__}")
 
@@ -39,7 +44,8 @@ class KafkaOrderSignalConsumer:
                 bootstrap_servers=self._config.bootstrap_servers_list,
                 group_id=f"{self._config.kafka_group_id}-order-signal",
                 auto_offset_reset=self._config.kafka_auto_offset_reset,
-                enable_auto_commit=self._config.kafka_enable_auto_commit,
+                # 주문 결과는 DB 커밋 후에만 offset 커밋 (자동 커밋 시 처리 전 종료되면 유실)
+                enable_auto_commit=False,
                 value_deserializer=lambda m: m.decode('utf-8'),
             )
             await self._consumer.start()
@@ -65,7 +71,13 @@ class KafkaOrderSignalConsumer:
             logger.info("Daily strategy Kafka consumer stopped")
 
     async def consume(self) -> None:
-        """메시지 수신 루프"""
+        """
+        메시지 수신 루프
+
+        한 번에 가져온 메시지 중 주문 시그널은 바로 처리하고, 주문 결과는 모아서
+        핸들러에 한 번에 전달. 처리가 끝난 뒤 offset을 커밋하므로 처리 전에
+        비정상 종료된 메시지는 재시작 시 다시 수신됨.
+        """
         if not self._consumer:
             logger.error("Order signal consumer not started")
             return
@@ -73,62 +85,95 @@ class KafkaOrderSignalConsumer:
         logger.info("Starting order signal message consumption loop...")
 
         try:
-            async for msg in self._consumer:
-                if not self._running:
-                    break
+            while self._running:
+                records = await self._consumer.getmany(
+                    timeout_ms=FETCH_TIMEOUT_MS, max_records=FETCH_MAX_RECORDS
+                )
+                if not records:
+                    continue
+
+                order_results: List[OrderResultMessage] = []
+                for messages in records.values():
+                    for msg in messages:
+                        order_result_msg = await self._handle_message(msg)
+                        if order_result_msg is not None:
+                            order_results.append(order_result_msg)
+
+                if order_results:
+                    await self._dispatch_order_results(order_results)
+
                 try:
-                    # JSON 파싱
-                    data = json.loads(msg.value)
-                    
-                    # 메시지 타입 구분 (order_no가 있으면 OrderResultMessage)
-                    if "order_no" in data:
-                        # 주문 결과 메시지 (주문 접수 또는 체결통보)
-                        try:
-                            order_result_msg = OrderResultMessage(**data)
-                            logger.info(
-                                f"Received order result message: order_no={order_result_msg.order_no}, "
-                                f"status={order_result_msg.status}, "
-                                f"user_strategy_id={order_result_msg.user_strategy_id}"
-                            )
-
-                            # 등록된 주문 결과 핸들러들 호출
-                            for handler in self._order_result_handlers:
-                                if asyncio.iscoroutinefunction(handler):
-                                    await handler(order_result_msg)
-                                else:
-                                    handler(order_result_msg)
-                        except Exception as e:
-                            logger.error(f"Order result handler error: {e}, data={data}", exc_info=True)
-                    else:
-                        # 기존 주문 시그널 메시지 (하위 호환성)
-                        try:
-                            order_signal_msg = OrderSignalMessage(**data)
-                            logger.info(
-                                f"Received order signal message: {order_signal_msg.user_strategy_id} "
-                                f"at {order_signal_msg.timestamp}"
-                            )
-
-                            # 등록된 주문 시그널 핸들러들 호출
-                            for handler in self._handlers:
-                                try:
-                                    if asyncio.iscoroutinefunction(handler):
-                                        await handler(order_signal_msg)
-                                    else:
-                                        handler(order_signal_msg)
-                                except Exception as e:
-                                    logger.error(f"Handler error: {e}", exc_info=True)
-                        except Exception as e:
-                            logger.error(f"Failed to parse OrderSignalMessage: {e}, data={data}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
+                    await self._consumer.commit()
                 except Exception as e:
-                    logger.error(f"Message processing error: {e}", exc_info=True)
+                    logger.error(f"Offset commit failed: {e}", exc_info=True)
 
         except Exception as e:
             logger.error(f"Consumer loop error: {e}", exc_info=True)
         finally:
             logger.info("Order signal message consumption loop ended")
 
+    async def _handle_message(self, msg) -> Optional[OrderResultMessage]:
+        """
+        메시지 1건 파싱 및 주문 시그널 처리
+
+        Returns:
+            주문 결과 메시지면 파싱 결과 (핸들러 호출은 consume에서 모아서 수행)
+        """
+        try:
+            # JSON 파싱
+            data = json.loads(msg.value)
+
+            # 메시지 타입 구분 (order_no가 있으면 OrderResultMessage)
+            if "order_no" in data:
+                # 주문 결과 메시지 (주문 접수 또는 체결통보)
+                try:
+                    order_result_msg = OrderResultMessage.model_validate(data)
+                    logger.info(
+                        f"Received order result message: order_no={order_result_msg.order_no}, "
+                        f"status={order_result_msg.status}, "
+                        f"user_strategy_id={order_result_msg.user_strategy_id}"
+                    )
+                    return order_result_msg
+                except Exception as e:
+                    logger.error(f"Failed to parse OrderResultMessage: {e}, data={data}")
+            else:
+                # 기존 주문 시그널 메시지 (하위 호환성)
+                try:
+                    order_signal_msg = OrderSignalMessage.model_validate(data)
+                    logger.info(
+                        f"Received order signal message: {order_signal_msg.user_strategy_id} "
+                        f"at {order_signal_msg.timestamp}"
+                    )
+
+                    # 등록된 주문 시그널 핸들러들 호출
+                    for handler in self._handlers:
+                        try:
+                            if asyncio.iscoroutinefunction(handler):
+                                await handler(order_signal_msg)
+                            else:
+                                handler(order_signal_msg)
+                        except Exception as e:
+                            logger.error(f"Handler error: {e}", exc_info=True)
+                except Exception as e:
+                    logger.error(f"Failed to parse OrderSignalMessage: {e}, data={data}")
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+        except Exception as e:
+            logger.error(f"Message processing error: {e}", exc_info=True)
+        return None
+
+    async def _dispatch_order_results(self, order_results: List[OrderResultMessage]) -> None:
+        """등록된 주문 결과 핸들러들 호출 (저장 실패는 로깅 후 다음 메시지 계속 처리)"""
+        for handler in self._order_result_handlers:
+            try:
+                if asyncio.iscoroutinefunction(handler):
+                    await handler(order_results)
+                else:
+                    handler(order_results)
+            except Exception as e:
+                order_nos = [message.order_no for message in order_results]
+                logger.error(f"Order result handler error: {e}, order_nos={order_nos}", exc_info=True)
+
     async def check_connection(self) -> bool:
         """Kafka 연결 상태 확인"""
         if not self._consumer:
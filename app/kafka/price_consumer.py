@@ -5,18 +5,23 @@ Kafka Consumer for Real-time Price Data
 """
 
 import asyncio
-import json
 import logging
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Tuple
 
 from aiokafka import AIOKafkaConsumer
 from aiokafka.errors import KafkaConnectionError
+from pydantic import ValidationError
 
 from app.config.kafka_connections import get_kafka_config
 from app.schemas.price import PriceMessage
+from app.utils.error_log_sampler import ErrorLogSampler
 
 logger = logging.getLogger(__name__)
 
+# getmany 1회 최대 대기 시간 / 최대 레코드 수
+FETCH_TIMEOUT_MS = 100
+FETCH_MAX_RECORDS = 500
+
 
 class KafkaPriceConsumer:
     """실시간 가격 데이터를 수신하는 Kafka Consumer"""
@@ -25,11 +30,14 @@ class KafkaPriceConsumer:
         self._config = get_kafka_config()
         self._consumer: Optional[AIOKafkaConsumer] = None
         self._running = False
-        self._handlers: List[Callable[[PriceMessage], None]] = []
+        # 틱마다 반복되는 에러는 traceback 샘플링
+        self._error_log = ErrorLogSampler(logger)
+        # (핸들러, 코루틴 함수 여부) - 코루틴 여부는 등록 시 한 번만 판별
+        self._handlers: List[Tuple[Callable[[PriceMessage], None], bool]] = []
 
     def add_handler(self, handler: Callable[[PriceMessage], None]) -> None:
         """메시지 수신 시 호출될 핸들러 등록"""
-        self._handlers.append(handler)
+        self._handlers.append((handler, asyncio.iscoroutinefunction(handler)))
         logger.info(f"Price handler registered: {handler.__name__}")
 
     async def start(self) -> bool:
@@ -41,7 +49,6 @@ class KafkaPriceConsumer:
                 group_id=f"{self._config.kafka_group_id}-price",
                 auto_offset_reset=self._config.kafka_auto_offset_reset,
                 enable_auto_commit=self._config.kafka_enable_auto_commit,
-                value_deserializer=lambda m: m.decode('utf-8'),
             )
 
             await self._consumer.start()
@@ -76,36 +83,40 @@ class KafkaPriceConsumer:
         logger.info("Starting price message consumption loop...")
 
         try:
-            async for msg in self._consumer:
-                if not self._running:
-                    break
-
-                try:
-                    # JSON 파싱
-                    data = json.loads(msg.value)
-                    price_msg = PriceMessage(**data)
-
-                    # logger.debug(
-                    #     f"Received price data: "
-                    #     f"stock_code={price_msg.stock_code}, "
-                    #     f"current_price={price_msg.current_price}, "
-                    #     f"timestamp={price_msg.timestamp}"
-                    # )
-
-                    # 등록된 핸들러들 호출
-                    for handler in self._handlers:
+            # getmany로 배치 단위 수신 (메시지마다 fetch 대기하지 않음)
+            while self._running:
+                batches = await self._consumer.getmany(
+                    timeout_ms=FETCH_TIMEOUT_MS, max_records=FETCH_MAX_RECORDS
+                )
+                for messages in batches.values():
+                    for msg in messages:
                         try:
-                            if asyncio.iscoroutinefunction(handler):
-                                await handler(price_msg)
-                            else:
-                                handler(price_msg)
+                            # JSON 파싱 + 검증 (raw bytes -> 모델, 중간 dict 생성 없음)
+                            price_msg = PriceMessage.model_validate_json(msg.value)
+
+                            # logger.debug(
+                            #     f"Received price data: "
+                            #     f"stock_code={price_msg.stock_code}, "
+                            #     f"current_price={price_msg.current_price}, "
+                            #     f"timestamp={price_msg.timestamp}"
+                            # )
+
+                            # 등록된 핸들러들 호출
+                            for handler, is_coroutine in self._handlers:
+                                try:
+                                    if is_coroutine:
+                                        await handler(price_msg)
+                                    else:
+                                        handler(price_msg)
+                                except Exception as e:
+                                    self._error_log.error("handler", "Price handler error: %s", e)
+
+                        except ValidationError as e:
+                            logger.error("Message validation error: %s", e)
                         except Exception as e:
-                            logger.error(f"Price handler error: {e}", exc_info=True)
-
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
-                except Exception as e:
-                    logger.error(f"Price message processing error: {e}", exc_info=True)
+                            self._error_log.error(
+                                "processing", "Price message processing error: %s", e
+                            )
 
         except Exception as e:
             logger.error(f"Price consumer loop error: {e}", exc_info=True)
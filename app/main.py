@@ -74,7 +74,7 @@ async def lifespan(app: FastAPI):
     # 핸들러 등록
     daily_strategy_consumer.add_handler(daily_strategy_handler.handle_daily_strategy)
     order_signal_consumer.add_handler(order_signal_handler.handle_order_signal)
-    order_signal_consumer.add_order_result_handler(order_result_handler.handle_order_result)
+    order_signal_consumer.add_order_result_handler(order_result_handler.handle_order_results)
     price_consumer.add_handler(price_handler.handle_price)
     
     # Consumer 시작
@@ -167,6 +167,13 @@ async def lifespan(app: FastAPI):
     await websocket_cmd_consumer.stop()
     await asking_price_consumer.stop()
 
+    # 진행 중인 캔들 저장 완료 대기 (DB 종료 전)
+    await get_price_handler().close()
+    await get_candle_handler().close()
+
+    # 진행 중인 예수금 갱신 완료 대기 및 KIS 클라이언트 정리
+    await get_order_result_handler().close()
+
     # Producer 중지
     kafka_producer = get_kafka_producer()
     await kafka_producer.stop()
@@ -90,10 +90,8 @@ class AccountRepository:
         return account
     
     async def update_balance(self, account: Accounts, amount: float) -> Accounts:
-        """계좌 잔액 업데이트 (+/-)"""
+        """계좌 잔액 업데이트 (+/-, DB 반영은 호출자의 커밋 시 flush)"""
         account.account_balance += amount
-        await self.db.flush()
-        await self.db.refresh(account)
         return account
     
     async def delete(self, account: Accounts) -> None:
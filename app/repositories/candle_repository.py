@@ -3,13 +3,28 @@ Candle Repository - DB 접근 레이어
 """
 
 from datetime import date, time
-from typing import List, Optional
+from operator import itemgetter
+from typing import List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import column, select, table, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.database.strategy import HourCandleData, MinuteCandleData
 
+# 캔들 COPY 적재용 컬럼 (COPY 레코드 튜플 순서)
+HOUR_CANDLE_COLUMNS = (
+    "stock_code", "candle_date", "hour",
+    "open", "high", "low", "close", "volume", "trade_count",
+)
+MINUTE_CANDLE_COLUMNS = (
+    "stock_code", "candle_date", "candle_time", "minute_interval",
+    "open", "high", "low", "close", "volume", "trade_count",
+)
+
+# 충돌 시 갱신할 컬럼
+CANDLE_UPDATE_COLUMNS = ("open", "high", "low", "close", "volume", "trade_count")
+
 
 class CandleRepository:
     """캔들 데이터 DB 접근"""
@@ -94,3 +109,73 @@ class CandleRepository:
 
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
+
+    # ========================
+    # 캔들 적재 (COPY + upsert)
+    # ========================
+
+    async def upsert_hour_candles(self, candles: List[dict]) -> None:
+        """시간봉 데이터 upsert (커밋은 호출자)"""
+        to_record = itemgetter(*HOUR_CANDLE_COLUMNS)
+        await self._copy_upsert(
+            HourCandleData,
+            "tmp_hour_candle_staging",
+            HOUR_CANDLE_COLUMNS,
+            "uq_hour_candle_stock_date_hour",
+            [to_record(c) for c in candles],
+        )
+
+    async def upsert_minute_candle_records(self, records: List[tuple]) -> None:
+        """분봉 레코드(MINUTE_CANDLE_COLUMNS 순서 튜플) upsert (커밋은 호출자)"""
+        await self._copy_upsert(
+            MinuteCandleData,
+            "tmp_minute_candle_staging",
+            MINUTE_CANDLE_COLUMNS,
+            "uq_minute_candle_stock_date_time_interval",
+            records,
+        )
+
+    async def _copy_upsert(
+        self,
+        model,
+        staging_table: str,
+        columns: Sequence[str],
+        constraint: str,
+        records: List[tuple],
+    ) -> None:
+        """
+        COPY로 임시 테이블에 적재한 뒤 INSERT ... SELECT ... ON CONFLICT 한 번으로 반영
+
+        행마다 파라미터를 바인딩하는 대량 INSERT 대신 PostgreSQL 가장 빠른 적재 경로 사용.
+        임시 테이블은 WAL 기록이 없고 트랜잭션 종료 시 자동 삭제됨.
+        """
+        if not records:
+            return
+
+        conn = await self.db.connection()
+
+        # 컬럼 타입은 원본 테이블과 동일
+        await conn.execute(text(
+            f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS "
+            f"SELECT {', '.join(columns)} "
+            f"FROM {model.__table__.fullname} WITH NO DATA"
+        ))
+
+        # 컬럼 순서 튜플 그대로 asyncpg COPY
+        raw_conn = await conn.get_raw_connection()
+        await raw_conn.driver_connection.copy_records_to_table(
+            staging_table,
+            records=records,
+            columns=list(columns),
+        )
+
+        staging = table(staging_table, *(column(col) for col in columns))
+        stmt = insert(model).from_select(
+            list(columns),
+            select(*(staging.c[col] for col in columns)),
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint=constraint,
+            set_={col: stmt.excluded[col] for col in CANDLE_UPDATE_COLUMNS},
+        )
+        await self.db.execute(stmt)
@@ -3,19 +3,45 @@ Stock Repository - DB 접근 레이어
 """
 
 from datetime import date, datetime
-from typing import Optional
-from sqlalchemy import select, func, cast, Date
+from typing import Optional, Tuple
+from sqlalchemy import and_, bindparam, select, func, cast, Date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.database.database.strategy import (
     UserStrategy,
     StrategyInfo,
     StrategyStatus,
     DailyStrategy,
+    DailyStrategyStock,
+    Order,
 )
 from app.database.database.stocks import StockPrices, StockMetadata
 
+# 주문 결과 컨텍스트 조회문 (모듈 로드 시 1회 생성, 실행 시 파라미터만 바인딩)
+# 종목 컬렉션 전체 대신 메시지의 종목 1건만 JOIN
+_ORDER_CONTEXT_STMT = (
+    select(DailyStrategy, DailyStrategyStock, Order)
+    .outerjoin(
+        DailyStrategyStock,
+        and_(
+            DailyStrategyStock.daily_strategy_id == DailyStrategy.id,
+            DailyStrategyStock.stock_code == bindparam("stock_code"),
+        ),
+    )
+    .outerjoin(Order, Order.order_no == bindparam("order_no"))
+    .options(
+        # many-to-one 체인은 본 쿼리에 JOIN (별도 SELECT 왕복 없음)
+        joinedload(DailyStrategy.user_strategy).joinedload(UserStrategy.account),
+    )
+    .where(
+        DailyStrategy.user_strategy_id == bindparam("user_strategy_id"),
+        func.date(DailyStrategy.timestamp) == bindparam("order_date")
+    )
+    .order_by(DailyStrategy.timestamp.desc())
+    .limit(1)
+)
+
 
 class StockRepository:
     """Stock DB 접근"""
@@ -94,18 +120,20 @@ class StockRepository:
         await self.db.delete(user_strategy)
         await self.db.flush()
 
-    async def get_daily_strategy_with_stocks(
-        self, user_strategy_id: int, order_date: date
-    ) -> DailyStrategy | None:
-        """일일 전략 조회 (종목, UserStrategy, Account 포함)"""
-        # created_at은 DateTime이므로 날짜 부분만 비교
-        # 또는 timestamp 필드의 날짜 부분을 비교
-        # 같은 날짜에 여러 레코드가 있을 수 있으므로 가장 최근 레코드를 선택
+    async def get_daily_strategy_with_stock(
+        self, user_strategy_id: int, order_date: date, stock_code: str
+    ) -> Tuple[DailyStrategy | None, DailyStrategyStock | None]:
+        """
+        일일 전략 + 단일 종목 조회 (종목 컬렉션 전체 로드 없이 LEFT JOIN 한 번)
+        """
         result = await self.db.execute(
-            select(DailyStrategy)
-            .options(
-                selectinload(DailyStrategy.stocks),
-                selectinload(DailyStrategy.user_strategy).selectinload(UserStrategy.account),
+            select(DailyStrategy, DailyStrategyStock)
+            .outerjoin(
+                DailyStrategyStock,
+                and_(
+                    DailyStrategyStock.daily_strategy_id == DailyStrategy.id,
+                    DailyStrategyStock.stock_code == stock_code,
+                ),
             )
             .where(
                 DailyStrategy.user_strategy_id == user_strategy_id,
@@ -114,7 +142,51 @@ class StockRepository:
             .order_by(DailyStrategy.timestamp.desc())
             .limit(1)
         )
-        return result.scalars().first()
+        row = result.first()
+        if row is None:
+            return None, None
+        return row[0], row[1]
+
+    async def get_total_buy_amount(self, daily_strategy_id: int) -> float:
+        """일일 전략의 종목별 매수 금액 합계 (DB 집계)"""
+        result = await self.db.execute(
+            select(
+                func.sum(DailyStrategyStock.buy_price * DailyStrategyStock.buy_quantity)
+            ).where(
+                DailyStrategyStock.daily_strategy_id == daily_strategy_id,
+                DailyStrategyStock.buy_price.isnot(None),
+                DailyStrategyStock.buy_quantity.isnot(None),
+            )
+        )
+        return result.scalar() or 0.0
+
+    async def get_order_context(
+        self,
+        order_no: str,
+        user_strategy_id: int,
+        order_date: date,
+        stock_code: str,
+    ) -> Tuple[DailyStrategy | None, DailyStrategyStock | None, Order | None]:
+        """
+        주문 결과 처리용 컨텍스트 조회 (일일 전략 + 종목 + 기존 주문)
+
+        일일 전략, 해당 종목, 주문번호의 기존 Order를 하나의 쿼리로 조회 (LEFT JOIN)
+        """
+        result = await self.db.execute(
+            _ORDER_CONTEXT_STMT,
+            {
+                "order_no": order_no,
+                "stock_code": stock_code,
+                "user_strategy_id": user_strategy_id,
+                "order_date": order_date,
+            },
+        )
+        row = result.first()
+        if row is None:
+            return None, None, None
+
+        daily_strategy, daily_strategy_stock, order = row
+        return daily_strategy, daily_strategy_stock, order
 
     async def get_closing_price(self, stock_code: str, target_date: date) -> Optional[float]:
         """
@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
@@ -19,6 +20,12 @@ class DailyStrategyStock(BaseModel):
     signal: str
     created_at: datetime
 
+    @field_validator('stock_code', 'exchange')
+    @classmethod
+    def intern_string(cls, v: str) -> str:
+        """반복되는 종목코드/거래소 문자열을 intern (중복 객체 제거, dict/set 비교 가속)"""
+        return sys.intern(v)
+
     @field_validator('target_price', 'target_sell_price', 'take_profit_target', 'prob_up', mode='before')
     @classmethod
     def parse_string_to_float(cls, v):
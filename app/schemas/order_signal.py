@@ -1,7 +1,22 @@
 from datetime import datetime
+from enum import StrEnum
 from typing import Optional, List
 from pydantic import BaseModel, field_validator
 
+
+class OrderSide(StrEnum):
+    """주문 구분"""
+    BUY = "BUY"
+    SELL = "SELL"
+
+
+class OrderResultStatus(StrEnum):
+    """주문 결과 상태"""
+    ORDERED = "ordered"
+    PARTIALLY_EXECUTED = "partially_executed"
+    EXECUTED = "executed"
+
+
 class OrderSignalMessage(BaseModel):
     """주문 시그널 메시지 (기존 호환성 유지)"""
     timestamp: datetime
@@ -56,7 +71,7 @@ class OrderResultMessage(BaseModel):
     user_strategy_id: int
     daily_strategy_id: Optional[int] = None  # 신규 추가
     stock_name: Optional[str] = ""  # 신규 추가
-    order_type: str  # BUY or SELL
+    order_type: OrderSide  # BUY or SELL
     stock_code: str
     order_no: str  # 주문번호 (필수)
     order_quantity: int
@@ -64,7 +79,7 @@ class OrderResultMessage(BaseModel):
     order_dvsn: str  # 주문구분 (00: 지정가, 01: 시장가 등)
     account_no: str
     is_mock: bool
-    status: str  # ordered, partially_executed, executed
+    status: OrderResultStatus  # ordered, partially_executed, executed
     executed_quantity: int  # 이번 체결 수량
     executed_price: float  # 이번 체결 가격
     # 부분 체결 정보
@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.candle_repository import CandleRepository
 from app.repositories.predict_repository import PredictRepository
 from app.services.price_cache import get_price_cache
-from app.handler.price_handler import aggregate_ticks_to_candle, aggregate_ticks_to_minute_candles
+from app.utils.candle_aggregator import aggregate_ticks_to_candle, aggregate_ticks_to_minute_candles
 
 logger = logging.getLogger(__name__)
 
@@ -144,18 +144,21 @@ class CandleService:
             cache_candles = aggregate_ticks_to_minute_candles(
                 stock_code, ticks, today, minute_interval
             )
-            for c in cache_candles:
-                candle_time_str = c["candle_time"].strftime("%H:%M:%S")
+            # 분봉은 MINUTE_CANDLE_COLUMNS 순서의 튜플
+            for (
+                _, candle_date, candle_time, _, open_, high, low, close, volume, trade_count
+            ) in cache_candles:
+                candle_time_str = candle_time.strftime("%H:%M:%S")
                 if candle_time_str not in db_times:
                     all_candles.append({
-                        "candle_date": c["candle_date"].isoformat(),
+                        "candle_date": candle_date.isoformat(),
                         "candle_time": candle_time_str,
-                        "open": c["open"],
-                        "high": c["high"],
-                        "low": c["low"],
-                        "close": c["close"],
-                        "volume": c["volume"],
-                        "trade_count": c["trade_count"],
+                        "open": open_,
+                        "high": high,
+                        "low": low,
+                        "close": close,
+                        "volume": volume,
+                        "trade_count": trade_count,
                     })
 
         # 시간순 정렬
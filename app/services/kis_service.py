@@ -17,13 +17,38 @@ KIS_PAPER_URL = "https://openapivts.koreainvestment.com:29443"  # 모의
 class KISService:
     """한국투자증권 API 클라이언트"""
     
-    def __init__(self, app_key: str, app_secret: str, is_paper: bool = False):
+    def __init__(
+        self,
+        app_key: str,
+        app_secret: str,
+        is_paper: bool = False,
+        client: httpx.AsyncClient | None = None,
+    ):
+        """
+        Args:
+            client: 재사용할 HTTP 클라이언트 (keep-alive/TLS 세션 재사용).
+                    없으면 요청마다 클라이언트를 생성/종료
+        """
         self.app_key = app_key
         self.app_secret = app_secret
         self.is_paper = is_paper
         self.base_url = KIS_PAPER_URL if is_paper else KIS_BASE_URL
         self.access_token: str | None = None
         self.token_expired_at: datetime | None = None
+        self._client = client
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """HTTP 요청 (공유 클라이언트가 있으면 재사용)"""
+        if self._client is not None:
+            return await self._client.request(method, url, **kwargs)
+        async with httpx.AsyncClient() as client:
+            return await client.request(method, url, **kwargs)
+
+    async def aclose(self) -> None:
+        """공유 HTTP 클라이언트 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def get_access_token(self) -> dict:
         """
@@ -52,24 +77,23 @@ class KISService:
             "charset": "UTF-8",
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload, headers=headers)
-            
-            # 403 에러 시 상세 정보 로깅
-            if response.status_code == 403:
-                logger.error(
-                    f"KIS API 403 Forbidden - URL: {url}, "
-                    f"AppKey: {self.app_key[:10]}..., "
-                    f"Response: {response.text}"
-                )
-                raise ValueError(
-                    f"KIS API 인증 실패 (403 Forbidden): "
-                    f"app_key/app_secret이 잘못되었거나 환경(실전/모의)이 일치하지 않습니다. "
-                    f"Response: {response.text}"
-                )
-            
-            response.raise_for_status()
-            data = response.json()
+        response = await self._request("POST", url, json=payload, headers=headers)
+
+        # 403 에러 시 상세 정보 로깅
+        if response.status_code == 403:
+            logger.error(
+                f"KIS API 403 Forbidden - URL: {url}, "
+                f"AppKey: {self.app_key[:10]}..., "
+                f"Response: {response.text}"
+            )
+            raise ValueError(
+                f"KIS API 인증 실패 (403 Forbidden): "
+                f"app_key/app_secret이 잘못되었거나 환경(실전/모의)이 일치하지 않습니다. "
+                f"Response: {response.text}"
+            )
+
+        response.raise_for_status()
+        data = response.json()
         
         self.access_token = data.get("access_token")
         
@@ -127,10 +151,9 @@ class KISService:
             "CTX_AREA_NK100": "",
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await self._request("GET", url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
         
         return data
     
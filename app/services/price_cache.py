@@ -8,7 +8,7 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta, date
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, NamedTuple, Tuple
 from threading import Lock
 from zoneinfo import ZoneInfo
 
@@ -20,6 +20,14 @@ KST = ZoneInfo("Asia/Seoul")
 MARKET_CLOSE_HOUR = 8  # 익일 08시에 전일 캐시 정리
 
 
+class Tick(NamedTuple):
+    """집계용 틱 (캐시 저장 시 한 번만 파싱/검증)"""
+    hour: int  # 체결 시각 HH
+    minute: int  # 체결 시각 MM
+    price: float
+    volume: int
+
+
 def parse_trade_time_hour(trade_time: str) -> Optional[int]:
     """체결 시간에서 시간(hour) 추출 (HHMMSS -> HH)"""
     try:
@@ -34,8 +42,11 @@ class PriceCache:
     """실시간 가격 데이터 인메모리 캐시 (현재 시간만 유지)"""
 
     def __init__(self):
-        # {stock_code: [PriceMessage, ...]} - 현재 시간의 틱 데이터만 저장
-        self._cache: Dict[str, List[PriceMessage]] = {}
+        # {stock_code: [Tick, ...]} - 현재 시간의 틱 데이터만 저장 (검증 완료된 값)
+        self._cache: Dict[str, List[Tick]] = {}
+        # {stock_code: PriceMessage} - 현재 시간의 최신 가격 메시지 (SSE용)
+        self._latest: Dict[str, PriceMessage] = {}
+        self._tick_count: int = 0  # 전체 틱 수 (add 시 증가, 전체 순회 없이 조회)
         self._cache_date: Optional[date] = None
         self._current_hour: Optional[int] = None  # 현재 캐시에 저장된 시간
         self._lock = Lock()
@@ -46,6 +57,8 @@ class PriceCache:
         today = datetime.now(KST).date()
         if self._cache_date != today:
             self._cache.clear()
+            self._latest.clear()
+            self._tick_count = 0
             self._cache_date = today
             self._current_hour = None
             logger.info(f"Price cache reset for new day: {today}")
@@ -67,10 +80,13 @@ class PriceCache:
             self._cleanup_task = None
         logger.info("Price cache stopped")
 
-    def set(self, price_msg: PriceMessage) -> Tuple[bool, Optional[int], Optional[Dict[str, List[PriceMessage]]]]:
+    def set(self, price_msg: PriceMessage) -> Tuple[bool, Optional[int], Optional[Dict[str, List[Tick]]]]:
         """
         가격 데이터 저장
 
+        가격/거래량 파싱 및 검증은 여기서 한 번만 수행하고,
+        잘못된 틱은 캐시에 넣지 않음 (집계 시 재검증 불필요)
+
         Args:
             price_msg: 가격 메시지
 
@@ -83,6 +99,18 @@ class PriceCache:
         if current_hour is None:
             return (False, None, None)
 
+        try:
+            # 체결 시각(HHMMSS)은 여기서 한 번만 파싱 (집계 시 문자열 슬라이싱 없음)
+            tick = Tick(
+                current_hour,
+                int(price_msg.trade_time[2:4]),
+                float(price_msg.current_price),
+                int(price_msg.trade_volume),
+            )
+        except (ValueError, TypeError) as e:
+            logger.warning("Invalid tick data: stock_code=%s, error=%s", price_msg.stock_code, e)
+            return (False, None, None)
+
         with self._lock:
             self._check_and_reset_if_new_day()
 
@@ -96,11 +124,13 @@ class PriceCache:
                 prev_hour = self._current_hour
                 # 직전 시간 데이터 추출 및 삭제
                 prev_hour_data = {k: v.copy() for k, v in self._cache.items() if v}
-                self._cache.clear()
                 logger.info(
-                    f"Hour changed: {prev_hour} -> {current_hour}, "
-                    f"extracted {len(prev_hour_data)} stocks data"
+                    "Hour changed: %s -> %s, extracted %d stocks data, %d ticks",
+                    prev_hour, current_hour, len(prev_hour_data), self._tick_count,
                 )
+                self._cache.clear()
+                self._latest.clear()
+                self._tick_count = 0
 
             self._current_hour = current_hour
 
@@ -108,7 +138,9 @@ class PriceCache:
             stock_code = price_msg.stock_code
             if stock_code not in self._cache:
                 self._cache[stock_code] = []
-            self._cache[stock_code].append(price_msg)
+            self._cache[stock_code].append(tick)
+            self._latest[stock_code] = price_msg
+            self._tick_count += 1
 
             return (hour_changed, prev_hour, prev_hour_data)
 
@@ -117,29 +149,22 @@ class PriceCache:
         with self._lock:
             self._check_and_reset_if_new_day()
 
-            if stock_code not in self._cache or not self._cache[stock_code]:
-                return None
-
-            return self._cache[stock_code][-1]
+            return self._latest.get(stock_code)
 
     def get_all(self) -> Dict[str, PriceMessage]:
         """모든 종목의 최신 가격 데이터 조회"""
         with self._lock:
             self._check_and_reset_if_new_day()
 
-            result = {}
-            for stock_code, ticks in self._cache.items():
-                if ticks:
-                    result[stock_code] = ticks[-1]
-            return result
+            return dict(self._latest)
 
-    def get_ticks(self, stock_code: str) -> List[PriceMessage]:
+    def get_ticks(self, stock_code: str) -> List[Tick]:
         """특정 종목의 현재 시간 틱 데이터 조회"""
         with self._lock:
             self._check_and_reset_if_new_day()
             return self._cache.get(stock_code, []).copy()
 
-    def get_all_ticks(self) -> Dict[str, List[PriceMessage]]:
+    def get_all_ticks(self) -> Dict[str, List[Tick]]:
         """모든 종목의 현재 시간 틱 데이터 조회"""
         with self._lock:
             self._check_and_reset_if_new_day()
@@ -154,7 +179,7 @@ class PriceCache:
         with self._lock:
             return len(self._cache.get(stock_code, []))
 
-    def extract_all_data(self) -> Tuple[Optional[int], Dict[str, List[PriceMessage]]]:
+    def extract_all_data(self) -> Tuple[Optional[int], Dict[str, List[Tick]]]:
         """
         현재 캐시의 모든 데이터 추출 및 삭제 (STOP 명령용)
 
@@ -164,16 +189,22 @@ class PriceCache:
         with self._lock:
             current_hour = self._current_hour
             data = {k: v.copy() for k, v in self._cache.items() if v}
+            logger.info(
+                f"Extracted all data: hour={current_hour}, stocks={len(data)}, "
+                f"ticks={self._tick_count}"
+            )
             self._cache.clear()
+            self._latest.clear()
+            self._tick_count = 0
             self._current_hour = None
-            logger.info(f"Extracted all data: hour={current_hour}, stocks={len(data)}")
             return (current_hour, data)
 
     def delete(self, stock_code: str) -> bool:
         """가격 데이터 삭제"""
         with self._lock:
             if stock_code in self._cache:
-                del self._cache[stock_code]
+                self._tick_count -= len(self._cache.pop(stock_code))
+                self._latest.pop(stock_code, None)
                 logger.debug(f"Price deleted: stock_code={stock_code}")
                 return True
             return False
@@ -181,9 +212,11 @@ class PriceCache:
     def clear(self) -> None:
         """모든 캐시 데이터 삭제"""
         with self._lock:
-            total_ticks = sum(len(ticks) for ticks in self._cache.values())
+            total_ticks = self._tick_count
             stock_count = len(self._cache)
             self._cache.clear()
+            self._latest.clear()
+            self._tick_count = 0
             self._current_hour = None
             logger.info(f"Price cache cleared: {stock_count} stocks, {total_ticks} ticks removed")
 
@@ -193,9 +226,8 @@ class PriceCache:
             return len(self._cache)
 
     def total_ticks(self) -> int:
-        """캐시에 저장된 전체 틱 수 반환"""
-        with self._lock:
-            return sum(len(ticks) for ticks in self._cache.values())
+        """캐시에 저장된 전체 틱 수 반환 (O(1))"""
+        return self._tick_count
 
     def get_cache_date(self) -> Optional[date]:
         """캐시 날짜 반환"""
@@ -224,13 +256,10 @@ class PriceCache:
                 await asyncio.sleep(60)
 
 
-# 싱글톤 인스턴스
-_price_cache_instance: Optional[PriceCache] = None
+# 싱글톤 인스턴스 (모듈 import 시 1회 생성)
+_price_cache_instance = PriceCache()
 
 
 def get_price_cache() -> PriceCache:
     """Price Cache 싱글톤 인스턴스 반환"""
-    global _price_cache_instance
-    if _price_cache_instance is None:
-        _price_cache_instance = PriceCache()
     return _price_cache_instance
@@ -0,0 +1,102 @@
+"""
+틱 → 캔들 집계 모듈
+
+PriceHandler(시간 변경 시 저장), CandleHandler(STOP 시 저장), CandleService(실시간 조회)가
+같은 집계 결과를 쓰도록 한 곳에 둠
+"""
+
+from datetime import date, time
+from typing import Dict, List, Optional, Tuple
+
+from app.services.price_cache import Tick
+
+# 분봉 시각 캐시 (HHMM -> time), 캔들마다 time 객체 생성 방지
+MINUTE_TIME_CACHE: Dict[int, time] = {
+    hh * 100 + mm: time(hh, mm, 0) for hh in range(24) for mm in range(60)
+}
+
+
+def aggregate_ticks_to_candle(
+    stock_code: str,
+    ticks: List[Tick],
+    candle_date: date,
+    hour: int
+) -> Optional[dict]:
+    """틱 데이터를 단일 시간봉으로 집계"""
+    if not ticks:
+        return None
+
+    # 틱은 캐시 저장 시 이미 검증됨
+    # 고가/저가/거래량은 내장 함수(C 루프)로 한 번에 계산
+    prices = [tick.price for tick in ticks]
+
+    return {
+        "stock_code": stock_code,
+        "candle_date": candle_date,
+        "hour": hour,
+        "open": prices[0],
+        "high": max(prices),
+        "low": min(prices),
+        "close": prices[-1],
+        "volume": sum(tick.volume for tick in ticks),
+        "trade_count": len(prices),
+    }
+
+
+def aggregate_ticks_to_minute_candles(
+    stock_code: str,
+    ticks: List[Tick],
+    candle_date: date,
+    minute_interval: int = 1
+) -> List[tuple]:
+    """
+    틱 데이터를 분봉으로 집계 (시각순)
+
+    dict 대신 MINUTE_CANDLE_COLUMNS 순서의 튜플로 반환 (COPY 레코드로 바로 사용)
+    (stock_code, candle_date, candle_time, minute_interval,
+     open, high, low, close, volume, trade_count)
+    """
+    if not ticks:
+        return []
+
+    # minute_interval에 맞게 그룹핑 (minute_key: HHMM)
+    # 예: 10분봉이면 0901~0910 → 0900, 0911~0920 → 0910
+    # 틱 목록을 모았다가 다시 순회하지 않고 한 번의 순회로 버킷 갱신
+    buckets: Dict[int, list] = {}
+    for hour, minute, price, volume in ticks:
+        minute_key = hour * 100 + (minute // minute_interval) * minute_interval
+        bucket = buckets.get(minute_key)
+        if bucket is None:
+            buckets[minute_key] = [price, price, price, price, volume, 1]
+        else:
+            if price > bucket[1]:
+                bucket[1] = price
+            if price < bucket[2]:
+                bucket[2] = price
+            bucket[3] = price
+            bucket[4] += volume
+            bucket[5] += 1
+
+    return [
+        (
+            stock_code,
+            candle_date,
+            MINUTE_TIME_CACHE[minute_key],
+            minute_interval,
+            *buckets[minute_key],
+        )
+        for minute_key in sorted(buckets)
+    ]
+
+
+def aggregate_stock_ticks(
+    stock_code: str,
+    ticks: List[Tick],
+    candle_date: date,
+    hour: int
+) -> Tuple[Optional[dict], List[tuple]]:
+    """종목 하나의 틱 데이터를 시간봉 + 분봉으로 집계"""
+    return (
+        aggregate_ticks_to_candle(stock_code, ticks, candle_date, hour),
+        aggregate_ticks_to_minute_candles(stock_code, ticks, candle_date),
+    )
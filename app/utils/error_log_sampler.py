@@ -0,0 +1,45 @@
+"""
+에러 로그 샘플링 모듈
+
+고빈도 경로(틱 단위 처리)에서 같은 에러가 반복될 때
+traceback은 첫 발생 및 N회마다 한 번만 기록 (스택 포맷 비용/로그 폭주 방지)
+"""
+
+import logging
+from typing import Dict
+
+
+class ErrorLogSampler:
+    """
+    에러 종류별 traceback 샘플링
+
+    매 발생마다 에러 메시지는 남기되, traceback은 첫 발생과 interval회마다만 포함
+    """
+
+    def __init__(self, logger: logging.Logger, interval: int = 1000):
+        """
+        Args:
+            logger: 기록할 로거
+            interval: traceback 포함 주기 (기본 1000회마다)
+        """
+        self.logger = logger
+        self.interval = interval
+        self._counts: Dict[str, int] = {}
+
+    def error(self, key: str, msg: str, exc: BaseException) -> None:
+        """
+        에러 기록 (key별 발생 횟수에 따라 traceback 포함 여부 결정)
+
+        Args:
+            key: 에러 구분 키 (호출 위치)
+            msg: 로그 메시지 (%s 자리에 예외 메시지)
+            exc: 발생한 예외
+        """
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+
+        with_traceback = count == 1 or count % self.interval == 0
+        self.logger.error(
+            msg + " (occurrences=%d)", exc, count,
+            exc_info=exc if with_traceback else None,
+        )
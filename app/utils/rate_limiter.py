@@ -45,6 +45,19 @@ class RateLimiter:
             return await func(*args, **kwargs)
         return wrapper
 
+    async def acquire(self) -> None:
+        """호출 1건 슬롯 확보 (필요 시 대기)"""
+        await self._wait_if_needed_async()
+
+    async def __aenter__(self) -> "RateLimiter":
+        """async with 진입 시 호출 슬롯 확보"""
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """슬롯은 시간 창 경과로 해제되므로 별도 처리 없음"""
+        return None
+
     def _wait_if_needed(self):
         """필요 시 대기 (동기)"""
         now = time.time()
@@ -1,9 +1,159 @@
 """
 Kafka order_signal 토픽 메시지 파싱 테스트
 """
+import enum
+import sys
 import pytest
 from datetime import datetime
-from app.schemas.order_signal import OrderResultMessage, PositionInfo
+from typing import List
+from types import ModuleType, SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from app.schemas.daily_strategy import DailyStrategyMessage
+from app.schemas.order_signal import OrderResultMessage, OrderResultStatus, OrderSide, PositionInfo
+
+
+def _install_database_stub() -> None:
+    """
+    app/database 서브모듈(모델 패키지)이 없을 때 핸들러 import용 최소 모델 등록
+
+    핸들러/레포지토리가 import 시 만드는 SQL 문에 필요한 컬럼/관계만 정의.
+    서브모듈이 체크아웃되어 있으면 실제 모델을 그대로 사용.
+    """
+    try:
+        import app.database.database  # noqa: F401
+        return
+    except ImportError:
+        pass
+
+    from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, Time
+    from sqlalchemy.orm import declarative_base, relationship
+
+    Base = declarative_base()
+
+    class AccountType(str, enum.Enum):
+        REAL = "REAL"
+        PAPER = "PAPER"
+        MOCK = "MOCK"
+
+    class Accounts(Base):
+        __tablename__ = "accounts"
+        id = Column(Integer, primary_key=True)
+        account_type = Column(String)
+        account_balance = Column(Float)
+
+    class StrategyStatus(str, enum.Enum):
+        ACTIVE = "ACTIVE"
+        INACTIVE = "INACTIVE"
+
+    class OrderStatus(str, enum.Enum):
+        ORDERED = "ORDERED"
+        PARTIALLY_EXECUTED = "PARTIALLY_EXECUTED"
+        EXECUTED = "EXECUTED"
+
+    class OrderType(str, enum.Enum):
+        BUY = "BUY"
+        SELL = "SELL"
+
+    class StrategyInfo(Base):
+        __tablename__ = "strategy_info"
+        id = Column(Integer, primary_key=True)
+
+    class UserStrategy(Base):
+        __tablename__ = "user_strategy"
+        id = Column(Integer, primary_key=True)
+        account_id = Column(Integer, ForeignKey("accounts.id"))
+        account = relationship(Accounts)
+
+    class DailyStrategy(Base):
+        __tablename__ = "daily_strategy"
+        id = Column(Integer, primary_key=True)
+        user_strategy_id = Column(Integer, ForeignKey("user_strategy.id"))
+        timestamp = Column(DateTime)
+        buy_amount = Column(Float)
+        sell_amount = Column(Float)
+        total_profit_amount = Column(Float)
+        user_strategy = relationship(UserStrategy)
+        stocks = relationship("DailyStrategyStock")
+
+    class DailyStrategyStock(Base):
+        __tablename__ = "daily_strategy_stock"
+        id = Column(Integer, primary_key=True)
+        daily_strategy_id = Column(Integer, ForeignKey("daily_strategy.id"))
+        stock_code = Column(String)
+
+    class Order(Base):
+        __tablename__ = "orders"
+        id = Column(Integer, primary_key=True)
+        order_no = Column(String)
+        daily_strategy_stock_id = Column(Integer, ForeignKey("daily_strategy_stock.id"))
+
+    class OrderExecution(Base):
+        __tablename__ = "order_execution"
+        id = Column(Integer, primary_key=True)
+        order_id = Column(Integer, ForeignKey("orders.id"))
+        execution_sequence = Column(Integer)
+
+    def candle_columns() -> dict:
+        """시간봉/분봉 공통 컬럼 (Column은 테이블마다 새로 생성)"""
+        return dict(
+            id=Column(Integer, primary_key=True),
+            stock_code=Column(String),
+            candle_date=Column(Date),
+            open=Column(Float),
+            high=Column(Float),
+            low=Column(Float),
+            close=Column(Float),
+            volume=Column(Integer),
+            trade_count=Column(Integer),
+        )
+
+    HourCandleData = type("HourCandleData", (Base,), {
+        "__tablename__": "hour_candle_data",
+        **candle_columns(),
+        "hour": Column(Integer),
+    })
+    MinuteCandleData = type("MinuteCandleData", (Base,), {
+        "__tablename__": "minute_candle_data",
+        **candle_columns(),
+        "candle_time": Column(Time),
+        "minute_interval": Column(Integer),
+    })
+
+    class StockPrices(Base):
+        __tablename__ = "stock_prices"
+        id = Column(Integer, primary_key=True)
+
+    class StockMetadata(Base):
+        __tablename__ = "stock_metadata"
+        id = Column(Integer, primary_key=True)
+
+    modules = {
+        "strategy": dict(
+            StrategyStatus=StrategyStatus, StrategyInfo=StrategyInfo, UserStrategy=UserStrategy,
+            DailyStrategy=DailyStrategy, DailyStrategyStock=DailyStrategyStock,
+            Order=Order, OrderExecution=OrderExecution, OrderStatus=OrderStatus,
+            OrderType=OrderType, HourCandleData=HourCandleData,
+            MinuteCandleData=MinuteCandleData,
+        ),
+        "users": dict(Accounts=Accounts, AccountType=AccountType),
+        "stocks": dict(StockPrices=StockPrices, StockMetadata=StockMetadata),
+    }
+    import app
+
+    package = ModuleType("app.database")
+    subpackage = ModuleType("app.database.database")
+    package.database = subpackage
+    app.database = package
+    sys.modules[package.__name__] = package
+    sys.modules[subpackage.__name__] = subpackage
+    for name, attrs in modules.items():
+        module = ModuleType(f"{subpackage.__name__}.{name}")
+        module.__dict__.update(attrs)
+        setattr(subpackage, name, module)
+        sys.modules[module.__name__] = module
+
+
+_install_database_stub()
 
 
 class TestOrderResultMessage:
@@ -435,6 +585,498 @@ class TestOrderResultMessageEdgeCases:
         assert msg.timestamp.month == 1
         assert msg.timestamp.day == 24
 
+        # UTC 'Z' 접미사
+        data["timestamp"] = "2026-01-24T00:01:00Z"
+        msg = OrderResultMessage(**data)
+        assert msg.timestamp.tzinfo is not None
+        assert msg.timestamp.utcoffset().total_seconds() == 0
+
+    def test_status_and_order_type_enum(self):
+        """status / order_type enum 파싱"""
+        data = {
+            "timestamp": "2026-01-24T09:01:00",
+            "user_strategy_id": 123,
+            "order_type": "SELL",
+            "stock_code": "005930",
+            "order_no": "0001234567",
+            "order_quantity": 10,
+            "order_price": 75000,
+            "order_dvsn": "00",
+            "account_no": "50123456-01",
+            "is_mock": False,
+            "status": "partially_executed",
+            "executed_quantity": 5,
+            "executed_price": 75000.0,
+            "total_executed_quantity": 5,
+            "total_executed_price": 75000.0,
+            "remaining_quantity": 5,
+            "is_fully_executed": False,
+        }
+
+        msg = OrderResultMessage(**data)
+        assert msg.order_type is OrderSide.SELL
+        assert msg.status is OrderResultStatus.PARTIALLY_EXECUTED
+
+        data["status"] = "unknown"
+        with pytest.raises(ValueError):
+            OrderResultMessage(**data)
+
+
+def make_order_result(**overrides) -> OrderResultMessage:
+    """체결통보 메시지 생성 (기본: MOCK 매수 10주 전량 체결)"""
+    data = {
+        "timestamp": "2026-01-24T09:01:00",
+        "user_strategy_id": 123,
+        "order_type": "BUY",
+        "stock_code": "005930",
+        "order_no": "MOCK-0001",
+        "order_quantity": 10,
+        "order_price": 1000,
+        "order_dvsn": "00",
+        "account_no": "MOCK",
+        "is_mock": True,
+        "status": "executed",
+        "executed_quantity": 10,
+        "executed_price": 1000,
+        "total_executed_quantity": 10,
+        "total_executed_price": 1000,
+        "remaining_quantity": 0,
+        "is_fully_executed": True,
+    }
+    data.update(overrides)
+    return OrderResultMessage(**data)
+
+
+@pytest.fixture
+def order_handler(monkeypatch):
+    """DB 없이 호출하는 OrderResultHandler (세션 객체 동기화는 setattr로 대체)"""
+    from app.handler import order_result_handler as module
+
+    monkeypatch.setattr(module, "set_committed_value", setattr)
+    return module.OrderResultHandler()
+
+
+class TestOrderResultHandler:
+    """OrderResultHandler 체결 반영 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_sell_delta_profit_rate(self, order_handler):
+        """SELL 체결: 전략 합계는 RETURNING 값으로 받고 수익률 계산"""
+        daily_strategy_stock = SimpleNamespace(
+            stock_code="005930", buy_price=1000.0, buy_quantity=10.0,
+            sell_price=None, sell_quantity=None, profit_rate=None,
+        )
+        daily_strategy = SimpleNamespace(
+            id=1, buy_amount=None, sell_amount=None,
+            total_profit_amount=None, total_profit_rate=None,
+        )
+        order = SimpleNamespace(
+            total_executed_price=1100.0, total_executed_quantity=10, is_fully_executed=True,
+        )
+        result = MagicMock()
+        # 다른 종목 합계까지 포함된 DB 값 (buy_amount, sell_amount, total_profit_amount)
+        result.one.return_value = (20000.0, 11000.0, 1000.0)
+        session = AsyncMock()
+        session.execute.return_value = result
+
+        await order_handler._update_daily_strategy_stock(
+            session, daily_strategy_stock, daily_strategy, order, OrderSide.SELL
+        )
+
+        params = session.execute.await_args.args[1]
+        assert params["sell_delta"] == 11000.0
+        assert params["profit_delta"] == 1000.0
+        assert session.execute.await_args.kwargs["execution_options"] == {"synchronize_session": False}
+        assert daily_strategy.buy_amount == 20000.0
+        assert daily_strategy.total_profit_rate == pytest.approx(5.0)
+        assert daily_strategy_stock.profit_rate == pytest.approx(10.0)
+
+    @pytest.mark.asyncio
+    async def test_mock_fill_balance_delta(self, order_handler):
+        """MOCK 체결: 잔액은 원자적 UPDATE의 RETURNING 값으로 반영"""
+        from app.handler.order_result_handler import AccountType
+
+        account = SimpleNamespace(id=7, account_type=AccountType.MOCK, account_balance=None)
+        daily_strategy = SimpleNamespace(user_strategy=SimpleNamespace(account=account))
+        result = MagicMock()
+        result.scalar_one.return_value = 925000
+        session = AsyncMock()
+        session.execute.return_value = result
+
+        await order_handler._update_account_balance_on_execution(
+            session, daily_strategy, SimpleNamespace(), OrderSide.BUY,
+            executed_quantity=1, executed_price=75000.0,
+        )
+
+        params = session.execute.await_args.args[1]
+        assert params == {"account_id": 7, "balance_delta": -75000.0}
+        assert session.execute.await_args.kwargs["execution_options"] == {"synchronize_session": False}
+        assert account.account_balance == 925000
+        assert not order_handler._balance_refresh_accounts
+
+    @pytest.mark.asyncio
+    async def test_sell_fill(self, order_handler):
+        """SELL 전량 체결: Order/종목/전략 합계 갱신, REAL 계좌는 커밋 후 예수금 갱신 예약"""
+        from app.handler.order_result_handler import AccountType
+
+        account = SimpleNamespace(id=3, account_type=AccountType.REAL)
+        daily_strategy = SimpleNamespace(
+            id=1, buy_amount=10000.0, sell_amount=0.0, total_profit_amount=0.0,
+            total_profit_rate=None,
+            user_strategy=SimpleNamespace(account=account),
+        )
+        daily_strategy_stock = SimpleNamespace(
+            id=11, stock_code="005930", buy_price=1000.0, buy_quantity=10.0,
+            sell_price=None, sell_quantity=None, profit_rate=None,
+        )
+        existing_order = SimpleNamespace(
+            id=21, status=None, total_executed_quantity=0, total_executed_price=0.0,
+            remaining_quantity=10, is_fully_executed=False,
+        )
+        result = MagicMock()
+        result.one.return_value = (10000.0, 12000.0, 2000.0)
+        session = AsyncMock()
+        session.execute.return_value = result
+        message = make_order_result(
+            order_type="SELL", order_no="0001234567", account_no="50123456-01", is_mock=False,
+            executed_price=1200, total_executed_price=1200,
+        )
+
+        row = await order_handler._handle_executed(
+            session, message, message.timestamp,
+            daily_strategy, daily_strategy_stock, existing_order,
+        )
+
+        assert row["order_id"] == 21
+        assert row["is_new_order"] is False
+        assert existing_order.total_executed_quantity == 10
+        assert existing_order.is_fully_executed is True
+        assert daily_strategy_stock.sell_price == 1200.0
+        assert daily_strategy_stock.profit_rate == pytest.approx(20.0)
+        assert daily_strategy.sell_amount == 12000.0
+        assert daily_strategy.total_profit_rate == pytest.approx(20.0)
+        # 전략 합계 UPDATE 1회만 (REAL 잔액은 DB 갱신 없이 KIS 조회 예약)
+        assert session.execute.await_count == 1
+        assert order_handler._balance_refresh_accounts == {3}
+
+    @pytest.mark.asyncio
+    async def test_mock_fill(self, order_handler):
+        """MOCK 매수 부분 체결: 이번 체결분만큼만 잔액 차감"""
+        from app.handler.order_result_handler import AccountType
+
+        account = SimpleNamespace(id=7, account_type=AccountType.MOCK, account_balance=1000000)
+        daily_strategy = SimpleNamespace(
+            id=1, buy_amount=0.0, sell_amount=0.0, total_profit_amount=0.0,
+            user_strategy=SimpleNamespace(account=account),
+        )
+        daily_strategy_stock = SimpleNamespace(
+            id=11, stock_code="005930", buy_price=1000.0, buy_quantity=4.0,
+            sell_price=None, sell_quantity=None,
+        )
+        existing_order = SimpleNamespace(
+            id=21, status=None, total_executed_quantity=4, total_executed_price=1000.0,
+            remaining_quantity=6, is_fully_executed=False,
+        )
+        strategy_result = MagicMock()
+        strategy_result.one.return_value = (10000.0, 0.0, 0.0)
+        balance_result = MagicMock()
+        balance_result.scalar_one.return_value = 990000
+        session = AsyncMock()
+        session.execute.side_effect = [strategy_result, balance_result]
+        message = make_order_result(
+            status="partially_executed", executed_quantity=6,
+            total_executed_quantity=10, remaining_quantity=0,
+        )
+
+        row = await order_handler._handle_executed(
+            session, message, message.timestamp,
+            daily_strategy, daily_strategy_stock, existing_order,
+        )
+
+        assert row["executed_quantity"] == 6
+        strategy_params = session.execute.await_args_list[0].args[1]
+        assert strategy_params["buy_delta"] == 6000.0
+        balance_params = session.execute.await_args_list[1].args[1]
+        assert balance_params == {"account_id": 7, "balance_delta": -6000.0}
+        assert account.account_balance == 990000
+        assert not order_handler._balance_refresh_accounts
+
+    @pytest.mark.asyncio
+    async def test_replayed_execution_skipped(self, order_handler):
+        """누적 체결 정보가 DB와 같은 재전송: 체결 row/합계/잔액 모두 갱신하지 않음"""
+        existing_order = SimpleNamespace(
+            id=21, status=None, total_executed_quantity=10, total_executed_price=1000.0,
+            remaining_quantity=0, is_fully_executed=True,
+        )
+        session = AsyncMock()
+
+        row = await order_handler._handle_executed(
+            session, make_order_result(), datetime(2026, 1, 24, 9, 1),
+            SimpleNamespace(id=1), SimpleNamespace(id=11), existing_order,
+        )
+
+        assert row is None
+        session.execute.assert_not_awaited()
+        assert not order_handler._balance_refresh_accounts
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_keeps_order_sequence(self, order_handler):
+        """배치 중 실패한 주문의 이후 메시지는 배치에서 반영하지 않고 수신 순서대로 재시도"""
+        first = make_order_result(
+            order_no="A", status="partially_executed", executed_quantity=4,
+            total_executed_quantity=4, remaining_quantity=6, is_fully_executed=False,
+        )
+        other = make_order_result(order_no="B")
+        second = make_order_result(
+            order_no="A", executed_quantity=6, total_executed_quantity=10,
+        )
+
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        nested = MagicMock()
+        nested.__aenter__ = AsyncMock()
+        nested.__aexit__ = AsyncMock(return_value=False)
+        session.begin_nested.return_value = nested
+        session.commit = AsyncMock()
+        order_handler._session_factory = MagicMock(return_value=session)
+
+        applied = []
+
+        async def apply_order_result(_session, _repository, message):
+            applied.append(message)
+            if message is first:
+                raise RuntimeError("deadlock detected")
+            return None
+
+        order_handler._apply_order_result = apply_order_result
+        order_handler._process_with_retry = AsyncMock()
+
+        await order_handler._process_batch([first, other, second])
+
+        assert applied == [first, other]
+        session.commit.assert_awaited_once()
+        retried = [c.args[0] for c in order_handler._process_with_retry.await_args_list]
+        assert retried == [first, second]
+        assert order_handler._is_duplicate(other)
+        assert not order_handler._is_duplicate(second)
+
+    @pytest.mark.asyncio
+    async def test_retry_failure_reaches_consumer(self, order_handler):
+        """재시도까지 실패한 메시지는 나머지 메시지 처리 후 예외로 전달 (중복 메시지는 제외)"""
+        failing = make_order_result(order_no="A")
+        ok = make_order_result(order_no="B")
+        duplicate = make_order_result(order_no="C")
+        order_handler._mark_processed([duplicate])
+
+        # 배치 세션 생성 실패 → 메시지 단위 재시도로 fallback
+        order_handler._session_factory = MagicMock(side_effect=RuntimeError("connection refused"))
+        order_handler._process_with_retry = AsyncMock(
+            side_effect=[RuntimeError("connection refused"), None]
+        )
+
+        with pytest.raises(RuntimeError):
+            await order_handler.handle_order_results([failing, ok, duplicate])
+
+        retried = [c.args[0] for c in order_handler._process_with_retry.await_args_list]
+        assert retried == [failing, ok]
+
+    @pytest.mark.asyncio
+    async def test_trailing_balance_refresh(self, order_handler):
+        """갱신 진행 중에 커밋된 체결은 진행 중 태스크 종료 후 다시 갱신"""
+        import asyncio
+
+        release = asyncio.Event()
+        calls = []
+
+        async def refresh(account_id, requested_at):
+            calls.append((account_id, requested_at))
+            if len(calls) == 1:
+                await release.wait()
+
+        order_handler._refresh_account_balance = refresh
+
+        order_handler._balance_refresh_accounts.add(3)
+        order_handler._schedule_balance_refreshes()
+        await asyncio.sleep(0)
+        # 첫 갱신 진행 중 같은 계좌 체결 커밋 → 새 태스크 없이 대기
+        order_handler._balance_refresh_accounts.add(3)
+        order_handler._schedule_balance_refreshes()
+        assert len(calls) == 1
+        assert not order_handler._balance_refresh_accounts
+
+        release.set()
+        # 종료 콜백이 재시작한 태스크까지 대기
+        while order_handler._balance_refresh_tasks:
+            await asyncio.gather(*order_handler._balance_refresh_tasks.values())
+
+        assert [account_id for account_id, _ in calls] == [3, 3]
+        assert calls[1][1] >= calls[0][1]
+        assert not order_handler._balance_refresh_tasks
+        assert not order_handler._balance_refresh_pending
+
+
+class TestCandleAggregation:
+    """시간 변경 저장(PriceHandler)과 STOP 저장(CandleHandler)의 캔들 집계 일치"""
+
+    @pytest.mark.asyncio
+    async def test_price_and_stop_handlers_build_same_candles(self):
+        from datetime import date, time
+        from app.handler.candle_handler import CandleHandler
+        from app.handler.price_handler import PriceHandler
+        from app.kafka.websocket_command_consumer import WebSocketCommandMessage
+        from app.services.price_cache import Tick
+
+        candle_date = date(2026, 1, 24)
+        hour_data = {
+            "005930": [
+                Tick(10, 0, 75000.0, 10),
+                Tick(10, 0, 75100.0, 5),
+                Tick(10, 0, 74900.0, 1),
+                Tick(10, 59, 75200.0, 3),
+            ],
+            "000660": [Tick(10, 30, 130000.0, 7)],
+        }
+
+        price_handler = PriceHandler()
+        price_handler._price_cache = MagicMock()
+        price_handler._price_cache.get_cache_date.return_value = candle_date
+        price_handler._save_candles_to_db = AsyncMock()
+        await price_handler._flush_previous_hour(10, hour_data)
+        price_candles, price_minute_candles = price_handler._save_candles_to_db.await_args.args
+
+        candle_handler = CandleHandler()
+        candle_handler._price_cache = MagicMock()
+        candle_handler._price_cache.total_ticks.return_value = 5
+        candle_handler._price_cache.extract_all_data.return_value = (10, hour_data)
+        candle_handler._price_cache.get_cache_date.return_value = candle_date
+        candle_handler._save_all_candles = AsyncMock()
+        await candle_handler.handle_stop_command(
+            WebSocketCommandMessage(command="STOP", timestamp="2026-01-24T10:59:59", target="ALL")
+        )
+        await candle_handler.close()
+        stop_candles, stop_minute_candles, _ = candle_handler._save_all_candles.await_args.args
+
+        assert stop_candles == price_candles
+        assert stop_minute_candles == price_minute_candles
+        assert ("005930", candle_date, time(10, 0), 1, 75000.0, 75100.0, 74900.0, 74900.0, 16, 3) \
+            in price_minute_candles
+        assert ("005930", candle_date, time(10, 59), 1, 75200.0, 75200.0, 75200.0, 75200.0, 3, 1) \
+            in price_minute_candles
+        assert len(price_minute_candles) == 3
+
+
+def make_daily_strategy_payload(user_strategy_id: int, stock_codes: List[str]) -> dict:
+    """일일 전략 payload 생성 (종목은 코드만 다르게)"""
+    return {
+        "user_strategy_id": user_strategy_id,
+        "user_id": 1,
+        "strategy_id": 1,
+        "strategy_name": "gap",
+        "strategy_weight_type": "equal",
+        "ls_ratio": 0.5,
+        "tp_ratio": 0.5,
+        "stocks": [
+            {
+                "stock_code": code,
+                "stock_name": code,
+                "exchange": "KOSPI",
+                "stock_open": 1000,
+                "target_price": 1000,
+                "target_quantity": 10,
+                "signal": "BUY",
+                "created_at": "2026-01-24T08:00:00",
+            }
+            for code in stock_codes
+        ],
+    }
+
+
+def make_daily_strategy_session(existing_daily_strategy):
+    """일일 전략 조회 결과가 existing_daily_strategy인 세션 mock"""
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = existing_daily_strategy
+    result.scalars.return_value.all.return_value = [10]
+
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    session.begin.return_value = transaction
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestDailyStrategyHandler:
+    """같은 user_strategy_id가 반복된 메시지는 마지막 payload만 반영"""
+
+    @staticmethod
+    def _message(*strategies) -> DailyStrategyMessage:
+        return DailyStrategyMessage(
+            timestamp="2026-01-24T08:30:00",
+            strategies_by_user=[{"user_id": 1, "strategies": list(strategies)}],
+        )
+
+    @pytest.mark.asyncio
+    async def test_last_payload_wins_for_new_strategy(self):
+        from sqlalchemy import Select
+        from app.handler.daily_strategy_handler import DailyStrategyHandler
+
+        session = make_daily_strategy_session(None)
+        handler = DailyStrategyHandler()
+        handler._session_factory = MagicMock(return_value=session)
+
+        await handler.handle_daily_strategy(self._message(
+            make_daily_strategy_payload(7, ["A", "B"]),
+            make_daily_strategy_payload(7, ["C"]),
+        ))
+
+        statements = [c.args[0] for c in session.execute.await_args_list]
+        assert sum(isinstance(stmt, Select) for stmt in statements) == 1
+        # 전략 INSERT 1건, 종목 INSERT는 마지막 payload의 종목만
+        strategy_rows = session.execute.await_args_list[1].args[1]
+        stock_rows = session.execute.await_args_list[2].args[1]
+        assert [row["user_strategy_id"] for row in strategy_rows] == [7]
+        assert [row["stock_code"] for row in stock_rows] == ["C"]
+        assert [row["daily_strategy_id"] for row in stock_rows] == [10]
+
+    @pytest.mark.asyncio
+    async def test_last_payload_replaces_existing_stocks(self):
+        from sqlalchemy import Delete
+        from app.handler.daily_strategy_handler import DailyStrategyHandler
+
+        untraded = SimpleNamespace(
+            id=1, stock_code="A", buy_price=None, buy_quantity=None,
+            sell_price=None, sell_quantity=None,
+        )
+        traded = SimpleNamespace(
+            id=2, stock_code="B", buy_price=1000.0, buy_quantity=10,
+            sell_price=None, sell_quantity=None,
+        )
+        existing = SimpleNamespace(id=5, timestamp=None, stocks=[untraded, traded])
+        session = make_daily_strategy_session(existing)
+        handler = DailyStrategyHandler()
+        handler._session_factory = MagicMock(return_value=session)
+
+        await handler.handle_daily_strategy(self._message(
+            make_daily_strategy_payload(7, ["A", "C"]),
+            make_daily_strategy_payload(7, ["D"]),
+        ))
+
+        # 마지막 payload에 없는 거래 기록 없는 종목은 삭제, 거래 기록 있는 종목은 보존
+        deletes = [
+            c.args[0] for c in session.execute.await_args_list
+            if isinstance(c.args[0], Delete)
+        ]
+        assert len(deletes) == 1
+        assert list(deletes[0].compile().params.values()) == [[1]]
+        # 앞선 payload의 종목(C)은 추가하지 않음
+        added = [c.args[0] for c in session.add.call_args_list]
+        assert [stock.stock_code for stock in added] == ["D"]
+        assert added[0].daily_strategy_id == 5
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])